@@ -61,6 +61,9 @@ setup(
             "build>=0.7.0",
             "twine>=3.4.0",
         ],
+        "speedups": [
+            "orjson>=3.9.0",  # Faster JSON output for optimized programs
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -7,15 +7,174 @@ identify resource bottlenecks, and optimize the schedule by
 staggering track and step starts to reduce resource contention.
 """
 
-import copy
 import json
 import logging
 import os
+import re
 import sys
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from collections import defaultdict
+from contextlib import contextmanager
+from operator import attrgetter, itemgetter
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple, Union
 
 import yaml
 
+try:
+    # Use the libyaml-backed loader and dumper when PyYAML was built with them
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+# Top-level program fields that might be required for schema validation
+_REQUIRED_FIELDS = frozenset(
+    {
+        "programId",
+        "name",
+        "description",
+        "version",
+        "environment",
+        "environmentType",
+        "actors",
+        "duration",
+        "startTrigger",
+        "resourceConstraints",
+        "trackTemplates",
+        "metadata",
+    }
+)
+
+
+# Runs of digits long enough to be an integer orjson would turn into a float
+_LONG_DIGITS_PATTERN = re.compile(rb"\d{19}")
+
+# Write buffer size for saved programs
+_OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Padding step inserted before bottleneck steps, copied and given an id per use
+_PADDING_STEP_TEMPLATE = {
+    "id": "",
+    "name": "Resource contention padding",
+    "description": "Added automatically to reduce resource contention",
+    "duration": 2,  # seconds
+    "resources": [],
+}
+
+
+def _convert_after_step_trigger(trigger: dict) -> dict:
+    return {"type": "afterStep", "stepId": trigger.get("stepId")}
+
+
+# Converters from the legacy "trigger" format to "startTrigger", keyed by type
+_TRIGGER_CONVERTERS = {
+    "programStart": lambda trigger: {"type": "programStart"},
+    "manual": lambda trigger: {"type": "manual"},
+    "afterStep": _convert_after_step_trigger,
+    "stepComplete": _convert_after_step_trigger,
+}
+
+
+def _clearing_delay(
+    intervals: List[Tuple[float, float]], reserved: List[Tuple[float, float]]
+) -> float:
+    """
+    Find the smallest delay that moves intervals clear of reserved intervals.
+
+    Args:
+        intervals: (start, end) intervals to be delayed together
+        reserved: (start, end) intervals that must not be overlapped
+
+    Returns:
+        Delay in seconds, 0 if the intervals already fit
+    """
+    delay = 0.0
+    moved = True
+    while moved:
+        moved = False
+        for start, end in intervals:
+            for reserved_start, reserved_end in reserved:
+                if start + delay < reserved_end and reserved_start < end + delay:
+                    # Push this interval to start when the reservation ends
+                    delay = reserved_end - start
+                    moved = True
+    return delay
+
+
+def _step_label(step: dict) -> str:
+    return step.get("name", step.get("stepId"))
+
+
+@contextmanager
+def _verbose_output(enabled: bool):
+    """
+    Echo planner log messages while planning verbosely.
+
+    Informational messages go to stdout along with the rest of the plan
+    output, errors and their tracebacks go to stderr. The module logger
+    doesn't propagate while this is active, so messages aren't also printed
+    by handlers on the root logger.
+
+    Args:
+        enabled: Whether verbose output was requested
+    """
+    if not enabled:
+        yield
+        return
+
+    formatter = logging.Formatter("%(message)s")
+    stdout_handler = logging.StreamHandler(sys.stdout)
+    stdout_handler.setFormatter(formatter)
+    stdout_handler.addFilter(lambda record: record.levelno < logging.ERROR)
+    stderr_handler = logging.StreamHandler(sys.stderr)
+    stderr_handler.setFormatter(formatter)
+    stderr_handler.setLevel(logging.ERROR)
+
+    previous_level = logger.level
+    previous_propagate = logger.propagate
+    logger.addHandler(stdout_handler)
+    logger.addHandler(stderr_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    try:
+        yield
+    finally:
+        logger.removeHandler(stdout_handler)
+        logger.removeHandler(stderr_handler)
+        logger.setLevel(previous_level)
+        logger.propagate = previous_propagate
+
+
+def _load_json(data: bytes) -> Any:
+    """
+    Parse JSON bytes with orjson, accepting the same input as json.loads.
+
+    orjson rejects NaN/Infinity and turns integers wider than 64 bits into
+    floats, so documents it rejects, and documents with long enough digit
+    runs to hold such an integer, are parsed by json.loads instead.
+
+    Args:
+        data: Raw JSON document
+
+    Returns:
+        The parsed document
+    """
+    if not _LONG_DIGITS_PATTERN.search(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Let json.loads accept it or raise its own error
+            pass
+    return json.loads(data)
+
 
 def load_program_file(file_path: str) -> dict:
     """
@@ -34,9 +193,13 @@ def load_program_file(file_path: str) -> dict:
     """
     try:
         _, file_extension = os.path.splitext(file_path)
-        with open(file_path, "r") as f:
+        # Both parsers detect the encoding themselves, so hand them raw bytes
+        # and skip decoding the whole file into a str first
+        with open(file_path, "rb") as f:
             if file_extension.lower() in [".yaml", ".yml"]:
-                return yaml.safe_load(f)
+                return yaml.load(f, Loader=_YamlLoader)
+            elif orjson is not None:
+                return _load_json(f.read())
             else:
                 return json.load(f)
     except FileNotFoundError:
@@ -55,6 +218,8 @@ class ResourceUsage:
     Track resource usage over time.
     """
 
+    __slots__ = ("usage_profile",)
+
     def __init__(self):
         # Dictionary mapping time points to resource usage counts
         self.usage_profile = {}
@@ -68,21 +233,21 @@ class ResourceUsage:
             end_time: End time of resource usage
             resource_id: Identifier for the resource
         """
+        usage_profile = self.usage_profile
+
         # Ensure we have entries for start and end times
-        if start_time not in self.usage_profile:
-            self.usage_profile[start_time] = {}
-        if end_time not in self.usage_profile:
-            self.usage_profile[end_time] = {}
+        start_changes = usage_profile.get(start_time)
+        if start_changes is None:
+            start_changes = usage_profile[start_time] = {}
+        end_changes = usage_profile.get(end_time)
+        if end_changes is None:
+            end_changes = usage_profile[end_time] = {}
 
         # Add resource usage at start time
-        if resource_id not in self.usage_profile[start_time]:
-            self.usage_profile[start_time][resource_id] = 0
-        self.usage_profile[start_time][resource_id] += 1
+        start_changes[resource_id] = start_changes.get(resource_id, 0) + 1
 
         # Remove resource usage at end time
-        if resource_id not in self.usage_profile[end_time]:
-            self.usage_profile[end_time][resource_id] = 0
-        self.usage_profile[end_time][resource_id] -= 1
+        end_changes[resource_id] = end_changes.get(resource_id, 0) - 1
 
     def calculate_usage_profile(self) -> Dict[str, List[Tuple[float, float, int]]]:
         """
@@ -91,33 +256,30 @@ class ResourceUsage:
         Returns:
             Dictionary mapping resource IDs to lists of (start_time, end_time, usage_count) tuples
         """
+        usage_profile = self.usage_profile
+
         # Sort time points
-        time_points = sorted(self.usage_profile.keys())
+        time_points = sorted(usage_profile)
 
         # Initialize result
         result: Dict[str, List[Tuple[float, float, int]]] = {}
 
         # Initialize current usage counts
-        current_usage = {}
-
-        # Process time points
-        for i in range(len(time_points) - 1):
-            current_time = time_points[i]
-            next_time = time_points[i + 1]
+        current_usage: Dict[str, int] = {}
 
+        # Process consecutive pairs of time points
+        for current_time, next_time in zip(time_points, time_points[1:]):
             # Update current usage counts
-            for resource_id, count_change in self.usage_profile[current_time].items():
-                if resource_id not in current_usage:
-                    current_usage[resource_id] = 0
-                current_usage[resource_id] += count_change
+            for resource_id, count_change in usage_profile[current_time].items():
+                usage = current_usage.get(resource_id, 0) + count_change
+                current_usage[resource_id] = usage
 
                 # Add to result if usage is positive
-                if current_usage[resource_id] > 0:
-                    if resource_id not in result:
-                        result[resource_id] = []
-                    result[resource_id].append(
-                        (current_time, next_time, current_usage[resource_id])
-                    )
+                if usage > 0:
+                    periods = result.get(resource_id)
+                    if periods is None:
+                        periods = result[resource_id] = []
+                    periods.append((current_time, next_time, usage))
 
         return result
 
@@ -134,14 +296,16 @@ class ResourceUsage:
             List of (resource_id, start_time, end_time, usage_count) tuples
         """
         usage_profile = self.calculate_usage_profile()
-        bottlenecks = []
-
-        for resource_id, usage_periods in usage_profile.items():
-            for start_time, end_time, count in usage_periods:
-                if count >= threshold:
-                    bottlenecks.append((resource_id, start_time, end_time, count))
+        bottlenecks = [
+            (resource_id, start_time, end_time, count)
+            for resource_id, usage_periods in usage_profile.items()
+            for start_time, end_time, count in usage_periods
+            if count >= threshold
+        ]
 
-        return sorted(bottlenecks, key=lambda x: (x[3], x[1]), reverse=True)
+        # Most concurrent uses first, then latest start time
+        bottlenecks.sort(key=itemgetter(3, 1), reverse=True)
+        return bottlenecks
 
 
 class Step:
@@ -149,6 +313,21 @@ class Step:
     Represents a step in the program.
     """
 
+    __slots__ = (
+        "data",
+        "track_id",
+        "id",
+        "name",
+        "priority",
+        "resources",
+        "dependencies",
+        "duration_data",
+        "duration_type",
+        "min_duration",
+        "max_duration",
+        "optimal_duration",
+    )
+
     def __init__(self, step_data: dict, track_id: str):
         self.data = step_data
         self.track_id = track_id
@@ -282,8 +461,9 @@ class ProgramPlanner:
         self.environment = environment
         self.steps = self._extract_steps()
         self.resource_usage = ResourceUsage()
-        self.min_resource_usage = ResourceUsage()
         self.max_resource_usage = ResourceUsage()
+        # Resource IDs per step dict, shared by the stagger passes
+        self._step_resource_ids: Dict[int, Tuple[dict, FrozenSet[str]]] = {}
         self.resource_constraints = None
         self.equipment_constraints = None
         if environment:
@@ -319,10 +499,90 @@ class ProgramPlanner:
 
         return steps
 
-    def simulate_execution(self) -> Dict[str, Dict[str, float]]:
+    def _copy_program_structure(self, copy_memo: Dict[int, Any]) -> dict:
+        """
+        Copy the parts of the program that optimization modifies.
+
+        The program, its tracks list, each track, each track's steps list and
+        each step are copied. Everything nested deeper (durations, resources,
+        metadata, ...) is shared with the original program, which is left
+        untouched.
+
+        Args:
+            copy_memo: Dictionary filled with id(original step) -> copied step
+
+        Returns:
+            Copy of the program that is safe to optimize in place
+        """
+        program = dict(self.program)
+        if "tracks" not in program:
+            return program
+
+        tracks = []
+        for track in program["tracks"]:
+            track = dict(track)
+            if "steps" in track:
+                steps = []
+                for step in track["steps"]:
+                    step_copy = copy_memo.get(id(step))
+                    if step_copy is None:
+                        step_copy = copy_memo[id(step)] = dict(step)
+                    steps.append(step_copy)
+                track["steps"] = steps
+            tracks.append(track)
+        program["tracks"] = tracks
+
+        return program
+
+    def _rebind_steps(self, copy_memo: Dict[int, Any]) -> Dict[str, Dict[str, Step]]:
+        """
+        Re-point existing Step objects at the steps of a deep copy of the program.
+
+        Only startTrigger fields and step order change when overlapping steps
+        are fixed, so each Step keeps its parsed durations and resources and
+        only has its data and dependencies refreshed.
+
+        Args:
+            copy_memo: Memo dictionary filled by _copy_program_structure
+
+        Returns:
+            Dictionary mapping track IDs to dictionaries mapping step IDs to Step objects
+        """
+        reusable: Dict[int, Step] = {}
+        for track_steps in self.steps.values():
+            for step in track_steps.values():
+                step_copy = copy_memo.get(id(step.data))
+                if step_copy is not None:
+                    reusable[id(step_copy)] = step
+
+        steps: Dict[str, Dict[str, Step]] = {}
+
+        for track in self.program.get("tracks", []):
+            track_id = track.get("id", "")
+            steps[track_id] = {}
+
+            for step_data in track.get("steps", []):
+                step = reusable.get(id(step_data))
+                if step is None:
+                    step = Step(step_data, track_id)
+                else:
+                    step.data = step_data
+                    step.resources = step_data.get("resources", [])
+                    step.dependencies = step._extract_dependencies()
+                steps[track_id][step_data.get("id", "")] = step
+
+        return steps
+
+    def simulate_execution(
+        self, track_worst_case: bool = True
+    ) -> Dict[str, Dict[str, float]]:
         """
         Simulate program execution to calculate start times.
 
+        Args:
+            track_worst_case: Whether to also record resource usage for the
+                max duration scenario in max_resource_usage
+
         Returns:
             Dictionary mapping track IDs to dictionaries mapping step IDs to start times
         """
@@ -347,24 +607,24 @@ class ProgramPlanner:
 
                     # Check if step can start
                     if self._can_start(step, completed, start_times):
-                        steps_to_start.append((track_id, step_id, step))
+                        steps_to_start.append(step)
 
             # If no steps can start, we're done
             if not steps_to_start:
                 break
 
             # Sort steps by priority (lower priority number comes first)
-            steps_to_start.sort(key=lambda x: x[2].priority)
+            steps_to_start.sort(key=attrgetter("priority"))
 
             # Schedule steps
-            for track_id, step_id, step in steps_to_start:
+            for step in steps_to_start:
                 start_time = self._calculate_start_time(step, start_times)
-                start_times[track_id][step_id] = start_time
-                completed.add((track_id, step_id))
+                start_times[step.track_id][step.id] = start_time
+                completed.add((step.track_id, step.id))
 
-                # Add resource usage for optimal duration (used for planning)
+                # Extract resource IDs from resource objects if they're dicts
+                resource_ids = []
                 for resource in step.resources:
-                    # Extract resource ID from resource object if it's a dict
                     resource_id = resource
                     if isinstance(resource, dict):
                         resource_id = (
@@ -373,43 +633,25 @@ class ProgramPlanner:
                             or resource.get("id")
                             or str(resource)
                         )
-                    self.resource_usage.add_usage(
-                        start_time, start_time + step.calculate_duration(), resource_id
-                    )
+                    resource_ids.append(resource_id)
 
-                # Add task usage for optimal duration
+                # Tasks are tracked alongside resources
                 task = step.data.get("task")
                 if task:
-                    self.resource_usage.add_usage(
-                        start_time, start_time + step.calculate_duration(), task
-                    )
+                    resource_ids.append(task)
 
-                # Also track min and max duration scenarios for bottleneck analysis
-                for resource in step.resources:
-                    # Extract resource ID from resource object if it's a dict
-                    resource_id = resource
-                    if isinstance(resource, dict):
-                        resource_id = (
-                            resource.get("resourceId")
-                            or resource.get("type")
-                            or resource.get("id")
-                            or str(resource)
+                # Add resource usage for optimal duration (used for planning)
+                optimal_end = start_time + step.calculate_duration()
+                for resource_id in resource_ids:
+                    self.resource_usage.add_usage(start_time, optimal_end, resource_id)
+
+                # Also track the max duration scenario for bottleneck analysis
+                if track_worst_case:
+                    max_end = start_time + step.get_max_duration()
+                    for resource_id in resource_ids:
+                        self.max_resource_usage.add_usage(
+                            start_time, max_end, resource_id
                         )
-                    self.min_resource_usage.add_usage(
-                        start_time, start_time + step.get_min_duration(), resource_id
-                    )
-                    self.max_resource_usage.add_usage(
-                        start_time, start_time + step.get_max_duration(), resource_id
-                    )
-
-                # Track task usage for min and max scenarios
-                if task:
-                    self.min_resource_usage.add_usage(
-                        start_time, start_time + step.get_min_duration(), task
-                    )
-                    self.max_resource_usage.add_usage(
-                        start_time, start_time + step.get_max_duration(), task
-                    )
 
         return start_times
 
@@ -420,18 +662,20 @@ class ProgramPlanner:
         Returns:
             Optimized program
         """
-        # Create a copy of the program to modify
-        optimized_program = copy.deepcopy(self.program)
+        # Create a copy of the program to modify, remembering which copied
+        # dict came from which original so existing Step objects can be reused
+        copy_memo: Dict[int, Any] = {}
+        optimized_program = self._copy_program_structure(copy_memo)
 
         # First, fix overlapping steps by properly sequencing them
         self._fix_overlapping_steps(optimized_program)
 
-        # Update the program and re-extract steps
+        # Update the program and re-point steps at the modified copy
         self.program = optimized_program
-        self.steps = self._extract_steps()
+        self.steps = self._rebind_steps(copy_memo)
 
         # Simulate execution to calculate resource usage
-        self.simulate_execution()
+        start_times = self.simulate_execution()
 
         # Find bottlenecks based on environment constraints
         bottlenecks = []
@@ -453,28 +697,19 @@ class ProgramPlanner:
                     for eq in self.equipment_constraints
                 }
 
-            # Check task-based bottlenecks
+            # Check task-based and equipment-based bottlenecks
             for (
                 resource_id,
                 usage_periods,
             ) in self.resource_usage.calculate_usage_profile().items():
-                # Check if this is a task constraint
-                if resource_id in task_limits:
-                    limit = task_limits[resource_id]
-                    for start_time, end_time, count in usage_periods:
-                        if count > limit:
-                            bottlenecks.append(
-                                (resource_id, start_time, end_time, count)
-                            )
-
-                # Check if this is an equipment constraint
-                if resource_id in equipment_limits:
-                    limit = equipment_limits[resource_id]
-                    for start_time, end_time, count in usage_periods:
-                        if count > limit:
-                            bottlenecks.append(
-                                (resource_id, start_time, end_time, count)
-                            )
+                for limits in (task_limits, equipment_limits):
+                    if resource_id in limits:
+                        limit = limits[resource_id]
+                        bottlenecks.extend(
+                            (resource_id, start_time, end_time, count)
+                            for start_time, end_time, count in usage_periods
+                            if count > limit
+                        )
         else:
             # Unlimited resources: no bottlenecks
             bottlenecks = []
@@ -487,13 +722,12 @@ class ProgramPlanner:
         seen_resources = set()
 
         # First add bottlenecks that appear in both optimal and max scenarios
+        max_bottleneck_resources = {b[0] for b in max_bottlenecks}
         for bottleneck in bottlenecks:
             resource_id = bottleneck[0]
-            for max_bottleneck in max_bottlenecks:
-                if max_bottleneck[0] == resource_id:
-                    combined_bottlenecks.append(bottleneck)
-                    seen_resources.add(resource_id)
-                    break
+            if resource_id in max_bottleneck_resources:
+                combined_bottlenecks.append(bottleneck)
+                seen_resources.add(resource_id)
 
         # Then add remaining bottlenecks from max scenario
         for bottleneck in max_bottlenecks:
@@ -510,23 +744,53 @@ class ProgramPlanner:
                 seen_resources.add(resource_id)
 
         if self.verbose and combined_bottlenecks:
-            print("Resource bottlenecks found:")
+            logger.info("Resource bottlenecks found:")
             for resource_id, start_time, end_time, count in combined_bottlenecks:
-                print(
-                    f"  Resource '{resource_id}': {count} concurrent uses from {start_time} to {end_time}"
+                logger.info(
+                    "  Resource '%s': %s concurrent uses from %s to %s",
+                    resource_id,
+                    count,
+                    start_time,
+                    end_time,
                 )
 
-        # Stagger track starts
-        self._stagger_track_starts(optimized_program, combined_bottlenecks)
+        # Without contention there is nothing to stagger
+        if combined_bottlenecks:
+            # Stagger step starts within tracks
+            self._stagger_step_starts(optimized_program, combined_bottlenecks)
 
-        # Stagger step starts within tracks
-        self._stagger_step_starts(optimized_program, combined_bottlenecks)
+            # Padding moves later steps back, so track starts are staggered
+            # against a simulation of the padded program
+            self.steps = self._extract_steps()
+            start_times = self._simulate_padded_execution()
+
+            # Stagger track starts
+            self._stagger_track_starts(
+                optimized_program, combined_bottlenecks, start_times
+            )
 
         # Ensure all required fields are preserved for schema validation
         self._preserve_required_fields(optimized_program)
 
         return optimized_program
 
+    def _simulate_padded_execution(self) -> Dict[str, Dict[str, float]]:
+        """
+        Simulate execution of the program after padding steps were added.
+
+        The resource usage recorded by the first simulation, which bottlenecks
+        were found from, is kept as it is.
+
+        Returns:
+            Dictionary mapping track IDs to dictionaries mapping step IDs to start times
+        """
+        resource_usage = self.resource_usage
+        self.resource_usage = ResourceUsage()
+        try:
+            return self.simulate_execution(track_worst_case=False)
+        finally:
+            self.resource_usage = resource_usage
+
     def _fix_overlapping_steps(self, program: dict):
         """
         Fix overlapping steps by properly sequencing them based on their triggers.
@@ -545,15 +809,9 @@ class ProgramPlanner:
                 if "trigger" in step:
                     old_trigger = step["trigger"]
                     if isinstance(old_trigger, dict):
-                        if old_trigger.get("type") == "programStart":
-                            step["startTrigger"] = {"type": "programStart"}
-                        elif old_trigger.get("type") == "manual":
-                            step["startTrigger"] = {"type": "manual"}
-                        elif old_trigger.get("type") in ["afterStep", "stepComplete"]:
-                            step["startTrigger"] = {
-                                "type": "afterStep",
-                                "stepId": old_trigger.get("stepId"),
-                            }
+                        convert = _TRIGGER_CONVERTERS.get(old_trigger.get("type"))
+                        if convert:
+                            step["startTrigger"] = convert(old_trigger)
                         elif "on" in old_trigger:
                             step["startTrigger"] = {
                                 "type": "afterStep",
@@ -587,15 +845,18 @@ class ProgramPlanner:
                                 "stepId": prev_step.get("stepId"),
                             }
                             if self.verbose:
-                                print(
-                                    f"Fixed step '{step.get('name', step.get('stepId'))}' to start after '{prev_step.get('name', prev_step.get('stepId'))}'"
+                                logger.info(
+                                    "Fixed step '%s' to start after '%s'",
+                                    _step_label(step),
+                                    _step_label(prev_step),
                                 )
                         else:
                             # First step should start with program
                             step["startTrigger"] = {"type": "programStart"}
                             if self.verbose:
-                                print(
-                                    f"Fixed step '{step.get('name', step.get('stepId'))}' to start with program"
+                                logger.info(
+                                    "Fixed step '%s' to start with program",
+                                    _step_label(step),
                                 )
                     else:
                         # Ensure the referenced step comes before this step
@@ -609,8 +870,10 @@ class ProgramPlanner:
                                 step.get("stepId"): j for j, step in enumerate(steps)
                             }
                             if self.verbose:
-                                print(
-                                    f"Moved step '{ref_step.get('name', ref_step.get('stepId'))}' before '{step.get('name', step.get('stepId'))}'"
+                                logger.info(
+                                    "Moved step '%s' before '%s'",
+                                    _step_label(ref_step),
+                                    _step_label(step),
                                 )
 
                 # If step has no explicit trigger and isn't the first step, make it start after the previous step
@@ -621,8 +884,10 @@ class ProgramPlanner:
                         "stepId": prev_step.get("stepId"),
                     }
                     if self.verbose:
-                        print(
-                            f"Fixed step '{step.get('name', step.get('stepId'))}' to start after '{prev_step.get('name', prev_step.get('stepId'))}'"
+                        logger.info(
+                            "Fixed step '%s' to start after '%s'",
+                            _step_label(step),
+                            _step_label(prev_step),
                         )
 
                 # If step has manual trigger and isn't the first step, make it start after the previous step
@@ -633,8 +898,10 @@ class ProgramPlanner:
                         "stepId": prev_step.get("stepId"),
                     }
                     if self.verbose:
-                        print(
-                            f"Fixed step '{step.get('name', step.get('stepId'))}' to start after '{prev_step.get('name', prev_step.get('stepId'))}'"
+                        logger.info(
+                            "Fixed step '%s' to start after '%s'",
+                            _step_label(step),
+                            _step_label(prev_step),
                         )
 
     def _adjust_variable_durations(self, program: dict):
@@ -657,8 +924,10 @@ class ProgramPlanner:
                         if min_seconds <= optimal <= max_seconds:
                             duration["defaultSeconds"] = optimal
                             if self.verbose:
-                                print(
-                                    f"Adjusted default duration for step '{step.get('id', '')}' to optimal value: {optimal}"
+                                logger.info(
+                                    "Adjusted default duration for step '%s' to optimal value: %s",
+                                    step.get("id", ""),
+                                    optimal,
                                 )
 
     def _can_start(
@@ -730,96 +999,190 @@ class ProgramPlanner:
 
         return start_time
 
+    def _get_step_resource_ids(self, step: dict) -> FrozenSet[str]:
+        """
+        Get the IDs of the resources used by a step.
+
+        Results are cached per step dict so repeated stagger passes over the
+        same program don't rebuild them.
+
+        Args:
+            step: Step data from the program
+
+        Returns:
+            Frozen set of resource IDs/types used by the step
+        """
+        cached = self._step_resource_ids.get(id(step))
+        if cached is not None and cached[0] is step:
+            return cached[1]
+
+        # Extract resource IDs/types instead of the full resource objects
+        step_resource_ids = []
+        for resource in step.get("resources", []):
+            if isinstance(resource, dict) and resource is not None:
+                # Extract resource identifier (resourceId, type, or id)
+                resource_id = resource.get("resourceId")
+                if resource_id is None:
+                    resource_id = resource.get("type")
+                if resource_id is None:
+                    resource_id = resource.get("id")
+                if resource_id:
+                    step_resource_ids.append(resource_id)
+            else:
+                # Handle string resources directly
+                step_resource_ids.append(resource)
+
+        resource_ids = frozenset(step_resource_ids)
+        # Keep a reference to the step so its id() can't be reused while cached
+        self._step_resource_ids[id(step)] = (step, resource_ids)
+        return resource_ids
+
+    def _build_resource_index(self, program: dict) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Index which steps of the program use each resource.
+
+        The index refers to positions in the program's track and step lists,
+        so it must be rebuilt after steps are inserted or reordered.
+
+        Args:
+            program: Program to index
+
+        Returns:
+            Dictionary mapping resource IDs to lists of (track_index, step_index)
+            tuples in program order
+        """
+        resource_index: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+
+        for track_index, track in enumerate(program.get("tracks", [])):
+            for step_index, step in enumerate(track.get("steps", [])):
+                position = (track_index, step_index)
+                for resource_id in self._get_step_resource_ids(step):
+                    resource_index[resource_id].append(position)
+
+        return dict(resource_index)
+
     def _stagger_track_starts(
-        self, program: dict, bottlenecks: List[Tuple[str, float, float, int]]
+        self,
+        program: dict,
+        bottlenecks: List[Tuple[str, float, float, int]],
+        start_times: Dict[str, Dict[str, float]],
+        resource_index: Optional[Dict[str, List[Tuple[int, int]]]] = None,
     ):
         """
         Stagger track start times to reduce resource contention.
 
+        Tracks reserve the bottleneck resources in priority order. A track is
+        only delayed when its use of any of them would overlap a reservation
+        made by a higher priority track, and then only by the smallest amount
+        that clears all of them at once, so tracks that don't collide keep
+        their start times.
+
         Args:
             program: Program to modify
             bottlenecks: List of resource bottlenecks
+            start_times: Simulated start times from simulate_execution, for the
+                program as it is now, padding steps included
+            resource_index: Index from _build_resource_index, built if not given
         """
-        if not bottlenecks:
+        # Staggering needs at least two tracks competing for a resource
+        tracks = program.get("tracks", [])
+        if not bottlenecks or len(tracks) < 2:
             return
 
-        # Get tracks that use bottleneck resources
-        tracks = program.get("tracks", [])
+        if resource_index is None:
+            resource_index = self._build_resource_index(program)
 
-        # Extract bottleneck resources
-        bottleneck_resources = set(b[0] for b in bottlenecks)
+        # Extract bottleneck resources, keeping the order of the bottlenecks
+        # list so the result doesn't depend on hash order
+        bottleneck_resources = list(dict.fromkeys(b[0] for b in bottlenecks))
+
+        # The simulation starts every track at the first track's startTime, so
+        # simulated times are made relative to it and then moved to each
+        # track's own startTime
+        simulation_start = tracks[0].get("startTime", 0)
 
-        # Group tracks by resource usage
-        resource_to_tracks: Dict[str, List[int]] = {}
+        # Find when each track uses each bottleneck resource
+        track_usage: Dict[int, Dict[str, List[Tuple[float, float]]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
         for resource in bottleneck_resources:
-            resource_to_tracks[resource] = []
+            for track_index, step_index in resource_index.get(resource, ()):
+                track_id = tracks[track_index].get("id", "")
+                step_id = tracks[track_index]["steps"][step_index].get("id", "")
+                start = start_times.get(track_id, {}).get(step_id)
+                if start is None:
+                    # Step was never scheduled in the simulation
+                    continue
+                start += tracks[track_index].get("startTime", 0) - simulation_start
+                end = start + self.steps[track_id][step_id].calculate_duration()
+                track_usage[track_index][resource].append((start, end))
 
-        # Track priorities based on the average priority of steps in each track
-        track_priorities = {}
+        # Track priorities based on the average priority of steps in each track,
+        # stored as a list parallel to tracks
+        track_priorities: List[float] = []
 
-        for i, track in enumerate(tracks):
-            track_id = track.get("id", "")
-            track_resources = set()
-            track_steps = []
+        for track in tracks:
+            priority_sum = 0
+            step_count = 0
 
             for step in track.get("steps", []):
-                # Extract resource IDs/types instead of the full resource objects
-                step_resource_ids = []
-                for resource in step.get("resources", []):
-                    if isinstance(resource, dict) and resource is not None:
-                        # Extract resource identifier (resourceId, type, or id)
-                        resource_id = resource.get("resourceId")
-                        if resource_id is None:
-                            resource_id = resource.get("type")
-                        if resource_id is None:
-                            resource_id = resource.get("id")
-                        if resource_id:
-                            step_resource_ids.append(resource_id)
-                    else:
-                        # Handle string resources directly
-                        step_resource_ids.append(resource)
-
-                step_resources = set(step_resource_ids)
-                track_resources.update(step_resources)
-                track_steps.append(step)
+                priority_sum += step.get("priority", 100)
+                step_count += 1
 
             # Calculate average priority for the track based on its steps
-            if track_steps:
-                avg_priority = sum(
-                    step.get("priority", 100)
-                    for step in track_steps
-                    if step is not None
-                ) / len(track_steps)
-                track_priorities[i] = avg_priority
-            else:
-                track_priorities[i] = 100  # Default priority
-
-            for resource in track_resources.intersection(bottleneck_resources):
-                resource_to_tracks[resource].append(i)
+            track_priorities.append(
+                priority_sum / step_count if step_count else 100  # Default priority
+            )
 
         # Stagger track start times
-        stagger_interval = 5  # seconds
-        for resource, track_indices in resource_to_tracks.items():
-            # Sort track indices by priority (lower priority number comes first)
-            track_indices.sort(key=lambda idx: track_priorities[idx])
-
-            for i, track_index in enumerate(track_indices):
-                # Skip the first track (highest priority)
-                if i == 0:
-                    continue
+        verbose = self.verbose
+        reserved: Dict[str, List[Tuple[float, float]]] = defaultdict(list)
+        # Reserve resources for tracks by priority (lower number first), ties
+        # kept in program order
+        for track_index in sorted(track_usage, key=lambda i: (track_priorities[i], i)):
+            usage = track_usage[track_index]
+
+            # Delaying the track to clear one resource can make it collide on
+            # another, so repeat until it clears every resource it uses
+            delay = 0.0
+            moved = True
+            while moved:
+                moved = False
+                for resource, intervals in usage.items():
+                    extra_delay = _clearing_delay(
+                        [(start + delay, end + delay) for start, end in intervals],
+                        reserved[resource],
+                    )
+                    if extra_delay:
+                        delay += extra_delay
+                        moved = True
 
-                # Add stagger to track start time
-                track = tracks[track_index]
-                current_start = track.get("startTime", 0)
-                track["startTime"] = current_start + i * stagger_interval
+            for resource, intervals in usage.items():
+                reserved[resource].extend(
+                    (start + delay, end + delay) for start, end in intervals
+                )
 
-                if self.verbose:
-                    print(
-                        f"Staggered track '{track.get('id', '')}' start time to {track['startTime']} (priority: {track_priorities[track_index]:.1f})"
-                    )
+            if not delay:
+                continue
+
+            # Delay the track just enough to clear its resources
+            track = tracks[track_index]
+            new_start = track.get("startTime", 0) + delay
+            track["startTime"] = new_start
+
+            if verbose:
+                logger.info(
+                    "Staggered track '%s' start time to %s (priority: %.1f)",
+                    track.get("id", ""),
+                    new_start,
+                    track_priorities[track_index],
+                )
 
     def _stagger_step_starts(
-        self, program: dict, bottlenecks: List[Tuple[str, float, float, int]]
+        self,
+        program: dict,
+        bottlenecks: List[Tuple[str, float, float, int]],
+        resource_index: Optional[Dict[str, List[Tuple[int, int]]]] = None,
     ):
         """
         Stagger step start times within tracks to reduce resource contention.
@@ -827,73 +1190,81 @@ class ProgramPlanner:
         Args:
             program: Program to modify
             bottlenecks: List of resource bottlenecks
+            resource_index: Index from _build_resource_index, built if not given
         """
         if not bottlenecks:
             return
 
+        if resource_index is None:
+            resource_index = self._build_resource_index(program)
+
         # Extract bottleneck resources
-        bottleneck_resources = set(b[0] for b in bottlenecks)
+        bottleneck_resources = frozenset(b[0] for b in bottlenecks)
 
-        # Process tracks
-        for track in program.get("tracks", []):
-            # Find steps that use bottleneck resources and their priorities
-            bottleneck_steps = []
-            for i, step in enumerate(track.get("steps", [])):
-                # Extract resource IDs/types instead of the full resource objects
-                step_resource_ids = []
-                for resource in step.get("resources", []):
-                    if isinstance(resource, dict) and resource is not None:
-                        # Extract resource identifier (resourceId, type, or id)
-                        resource_id = resource.get("resourceId")
-                        if resource_id is None:
-                            resource_id = resource.get("type")
-                        if resource_id is None:
-                            resource_id = resource.get("id")
-                        if resource_id:
-                            step_resource_ids.append(resource_id)
-                    else:
-                        # Handle string resources directly
-                        step_resource_ids.append(resource)
-
-                step_resources = set(step_resource_ids)
-                if step_resources.intersection(bottleneck_resources):
-                    priority = step.get("priority", 100)
-                    bottleneck_steps.append((i, priority))
-
-            # Sort bottleneck steps by priority (higher priority/lower number first)
-            bottleneck_steps.sort(key=lambda x: x[1])
-            bottleneck_step_indices = [idx for idx, _ in bottleneck_steps]
-
-            # Add padding before bottleneck steps
-            padding = 2  # seconds
-            for step_index in bottleneck_step_indices:
-                # Skip the first step
-                if step_index == 0:
-                    continue
+        # Padding messages are collected and logged together once all tracks
+        # are processed
+        messages: Optional[List[str]] = [] if self.verbose else None
 
-                # Add padding step before bottleneck step
-                padding_step = {
-                    "id": f"padding_{track.get('id', '')}_{step_index}",
-                    "name": "Resource contention padding",
-                    "description": "Added automatically to reduce resource contention",
-                    "duration": padding,
-                    "resources": [],
-                }
+        # Find steps that use bottleneck resources, grouped by track
+        track_bottleneck_indices: Dict[int, Set[int]] = defaultdict(set)
+        for resource in bottleneck_resources:
+            for track_index, step_index in resource_index.get(resource, ()):
+                # Skip the first step, it has nothing to be padded against
+                if step_index > 0:
+                    track_bottleneck_indices[track_index].add(step_index)
 
-                track["steps"].insert(step_index, padding_step)
+        # Process tracks, each only touches its own step list
+        for track_index, track in enumerate(program.get("tracks", [])):
+            bottleneck_indices = track_bottleneck_indices.get(track_index)
+            if bottleneck_indices:
+                self._stagger_one_track(track, bottleneck_indices, messages)
 
-                # Update indices for remaining bottleneck steps
-                bottleneck_step_indices = [
-                    i + 1 if i >= step_index else i for i in bottleneck_step_indices
-                ]
+        if messages:
+            logger.info("\n".join(messages))
 
-                if self.verbose:
-                    step_priority = track.get("steps", [])[step_index + 1].get(
-                        "priority", 100
-                    )  # +1 because we inserted a step
-                    print(
-                        f"Added padding step before step {step_index} in track '{track.get('id', '')}' (priority: {step_priority})"
-                    )
+    def _stagger_one_track(
+        self,
+        track: dict,
+        bottleneck_indices: Set[int],
+        messages: Optional[List[str]] = None,
+    ):
+        """
+        Add padding steps before the bottleneck steps of a single track.
+
+        Args:
+            track: Track to modify
+            bottleneck_indices: Indices of the track's steps that use a bottleneck
+                resource, excluding the first step
+            messages: List to append verbose messages to, if any
+        """
+        # Bottleneck steps and their priorities
+        steps = track["steps"]
+        bottleneck_steps = {
+            i: steps[i].get("priority", 100) for i in bottleneck_indices
+        }
+
+        # Rebuild the step list in one pass, copying the runs of steps between
+        # bottleneck steps and adding padding before each bottleneck step
+        track_id = track.get("id", "")
+        new_steps = []
+        run_start = 0
+        for i, priority in sorted(bottleneck_steps.items()):
+            new_steps.extend(steps[run_start:i])
+            padding_step = _PADDING_STEP_TEMPLATE.copy()
+            padding_step["id"] = f"padding_{track_id}_{i}"
+            # Each padding step needs its own list, shared objects would be
+            # written out as YAML anchors
+            padding_step["resources"] = []
+            new_steps.append(padding_step)
+            run_start = i
+
+            if messages is not None:
+                messages.append(
+                    f"Added padding step before step {i} in track "
+                    f"'{track_id}' (priority: {priority})"
+                )
+        new_steps.extend(steps[run_start:])
+        track["steps"] = new_steps
 
     def _preserve_required_fields(self, program: dict):
         """
@@ -902,26 +1273,13 @@ class ProgramPlanner:
         Args:
             program: Program to modify
         """
-        # Preserve all top-level fields that might be required
-        required_fields = [
-            "programId",
-            "name",
-            "description",
-            "version",
-            "environment",
-            "environmentType",
-            "actors",
-            "duration",
-            "startTrigger",
-            "resourceConstraints",
-            "trackTemplates",
-            "metadata",
-        ]
-
-        # Copy any missing fields from the original program
-        for field in required_fields:
-            if field in self.program and field not in program:
-                program[field] = self.program[field]
+        # Copy any missing fields from the original program, keeping its order
+        source = self.program
+        missing = (_REQUIRED_FIELDS & source.keys()) - program.keys()
+        if missing:
+            program.update(
+                {field: source[field] for field in source if field in missing}
+            )
 
         # Don't add resourceConstraints if the program already has environment or environmentType
         # This would violate the schema's not clause
@@ -932,6 +1290,38 @@ class ProgramPlanner:
                 del program["resourceConstraints"]
 
 
+def _dump_json(program: dict) -> bytes:
+    """
+    Serialize a program to indented JSON bytes.
+
+    orjson is used when installed, unless its output would differ from
+    json.dumps: non-ASCII text is written raw instead of escaped, and
+    Infinity/NaN are written as null. Such programs, and programs orjson
+    can't serialize at all, go through json.dumps instead.
+
+    Args:
+        program: Program to serialize
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        try:
+            # orjson serializes straight to bytes, much faster than json.dumps
+            output = orjson.dumps(
+                program, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            # A null may stand for a non-finite float, so only trust output
+            # without one
+            if output.isascii() and b"null" not in output:
+                return output
+
+    return json.dumps(program, indent=2).encode("utf-8")
+
+
 def save_optimized_program(program: dict, output_file: str):
     """
     Save the optimized program to a file.
@@ -940,13 +1330,22 @@ def save_optimized_program(program: dict, output_file: str):
         program: Program to save
         output_file: Path to the output file
     """
-    _, file_extension = os.path.splitext(output_file)
+    output_path = os.fspath(output_file)
+    _, file_extension = os.path.splitext(output_path)
 
-    with open(output_file, "w") as f:
+    # Write UTF-8 bytes through one large buffer instead of a text wrapper
+    with open(output_path, "wb", buffering=_OUTPUT_BUFFER_SIZE) as f:
         if file_extension.lower() in [".yaml", ".yml"]:
-            yaml.dump(program, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(
+                program,
+                f,
+                Dumper=_YamlDumper,
+                encoding="utf-8",
+                default_flow_style=False,
+                sort_keys=False,
+            )
         else:
-            json.dump(program, f, indent=2)
+            f.write(_dump_json(program))
 
 
 def plan_program(
@@ -967,24 +1366,23 @@ def plan_program(
     Returns:
         True if successful, False otherwise
     """
-    try:
-        program = load_program_file(input_file)
-        environment = None
-        if environment_file:
-            environment = load_program_file(environment_file)
-        planner = ProgramPlanner(program, verbose, environment)
-        optimized_program = planner.optimize_schedule()
-        save_optimized_program(optimized_program, output_file)
-        if verbose:
-            print(f"Saved optimized program to {output_file}")
-        return True
-    except Exception as e:
-        print(f"Error planning program: {e}")
-        if verbose:
-            import traceback
-
-            traceback.print_exc()
-        return False
+    with _verbose_output(verbose):
+        try:
+            program = load_program_file(input_file)
+            environment = None
+            if environment_file:
+                environment = load_program_file(environment_file)
+            planner = ProgramPlanner(program, verbose, environment)
+            optimized_program = planner.optimize_schedule()
+            save_optimized_program(optimized_program, output_file)
+            if verbose:
+                logger.info("Saved optimized program to %s", output_file)
+            return True
+        except Exception as e:
+            print(f"Error planning program: {e}")
+            if verbose:
+                logger.exception("Error planning program")
+            return False
 
 
 if __name__ == "__main__":
@@ -8,24 +8,80 @@ allows manual triggering of steps with variable durations.
 """
 
 import argparse
-import curses
 import datetime
+import functools
+import heapq
 import json
 import logging
 import os
 import queue
 import re  # Add import for regular expressions
+import shlex
 import signal
 import subprocess
 import sys
 import threading
 import time
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from types import CodeType
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
-import yaml  # Add import for YAML support
 from colorama import Fore, Style
 
+# yaml and curses are imported where they are used: YAML is only parsed by the
+# fallback loader below, and curses is only needed by the terminal UI
+
+# Matches {rhyl.variable} placeholders in step code blocks
+_RHYL_VAR_RE = re.compile(r"\{rhyl\.([a-zA-Z0-9_]+)\}")
+
+# Most commands handled by a single ProgramRunner.update() call
+MAX_COMMANDS_PER_UPDATE = 64
+
+# Steps are completed once they are less than this many seconds from their
+# expected end, when their remaining time would display as "< 0.1s"
+_COMPLETION_THRESHOLD = 0.1
+
+# Longest wait for input between UI frames while the program runs, in seconds
+_FRAME_INTERVAL = 0.1
+
+# Matches the hour, minute and second components of time strings like "1h30m"
+_TIME_COMPONENT_RE = re.compile(r"(\d+)([hms])")
+_TIME_UNIT_SECONDS = {"h": 3600, "m": 60, "s": 1}
+
+
+# A runner command: ("start_program",), ("trigger", trigger_name[, step_id])
+# or ("abort", step_id)
+Command = Tuple[str, ...]
+
+
+def parse_command(command: str) -> Optional[Command]:
+    """
+    Parse a command string into a command tuple.
+
+    Accepts "start_program", "trigger:<name>", "trigger:<name>:<step_id>" and
+    "abort:<step_id>". Step IDs may contain ':'.
+
+    Args:
+        command: The command string
+
+    Returns:
+        The command tuple, or None if the string is not a known command
+    """
+    if command == "start_program":
+        return ("start_program",)
+
+    kind, sep, args = command.partition(":")
+    if not sep:
+        return None
+    if kind == "trigger":
+        trigger_name, has_step_id, step_id = args.partition(":")
+        if has_step_id:
+            return ("trigger", trigger_name, step_id)
+        return ("trigger", trigger_name)
+    if kind == "abort":
+        return ("abort", args)
+    return None
+
 
 # Define sort modes for the display
 class SortMode(Enum):
@@ -57,12 +113,20 @@ except ImportError:
     # Define our own load_program_file function if the validator is not available
     def load_program_file(file_path: str) -> Dict[str, Any]:
         """Load and parse a program file (JSON or YAML)."""
+        import yaml
+
+        try:
+            # Use the libyaml-backed loader when PyYAML was built with it
+            from yaml import CSafeLoader as _YamlLoader
+        except ImportError:
+            from yaml import SafeLoader as _YamlLoader
+
         try:
             with open(file_path, "r") as file:
                 # Determine file type based on extension
                 _, ext = os.path.splitext(file_path)
                 if ext.lower() in [".yaml", ".yml"]:
-                    return yaml.safe_load(file)
+                    return yaml.load(file, Loader=_YamlLoader)
                 else:  # Default to JSON
                     return json.load(file)
         except (json.JSONDecodeError, yaml.YAMLError) as e:
@@ -84,6 +148,183 @@ except ImportError:
         return []
 
 
+def _substitute_rhyl_variables(code: str, step_vars: "StepVariables") -> str:
+    """
+    Replace {rhyl.variable} placeholders with the step's variable values.
+
+    Placeholders naming unknown variables are left as they are. Braces that
+    are not placeholders are never touched, so code can use them freely.
+
+    Args:
+        code: The code to substitute variables in
+        step_vars: The step variables object
+
+    Returns:
+        The code with variables substituted
+    """
+    # Most code blocks have no placeholders, skip the regex entirely then
+    if "{rhyl." not in code:
+        return code
+
+    def replace_var(match):
+        value = step_vars.get(match.group(1), _UNSET)
+        if value is _UNSET:
+            return match.group(0)  # Return the original if not found
+        return str(value)
+
+    # Replace all {rhyl.variable} matches
+    return _RHYL_VAR_RE.sub(replace_var, code)
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_whole_seconds(seconds: int) -> str:
+    """
+    Format a whole number of seconds as "1h 2m 3s", "2m 3s" or "3s".
+
+    Args:
+        seconds: The number of seconds
+
+    Returns:
+        The formatted time
+    """
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+
+    if hours > 0:
+        return f"{hours}h {minutes}m {secs}s"
+    elif minutes > 0:
+        return f"{minutes}m {secs}s"
+    else:
+        return f"{seconds}s"
+
+
+@functools.lru_cache(maxsize=4096)
+def _isoformat_timestamp(timestamp: float) -> str:
+    """
+    Format a runner timestamp as an ISO 8601 local time string.
+
+    Step times are kept as float seconds and only formatted for serialization.
+    A step's times rarely change between calls, so results are cached.
+
+    Args:
+        timestamp: Seconds since the epoch
+
+    Returns:
+        The ISO 8601 formatted time
+    """
+    return datetime.datetime.fromtimestamp(timestamp).isoformat()
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_iso_timestamp(time_str: str) -> float:
+    """
+    Parse an ISO 8601 time string into seconds since the epoch.
+
+    Absolute start triggers are checked on every update while their step is
+    pending, so the parsed times are cached.
+
+    Args:
+        time_str: The ISO 8601 time
+
+    Returns:
+        Seconds since the epoch
+    """
+    return datetime.datetime.fromisoformat(time_str).timestamp()
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_python_code(source: str) -> CodeType:
+    """
+    Compile a Python code block, caching the code object.
+
+    A step's code block substitutes to the same source each time it runs, so
+    repeated executions reuse the compiled code.
+
+    Args:
+        source: The Python source with variables substituted
+
+    Returns:
+        The compiled code object
+    """
+    return compile(source, "<string>", "exec")
+
+
+# Characters that need the shell to interpret the command, as well as
+# builtins and keywords that only the shell provides or that behave
+# differently as standalone programs
+_SHELL_SYNTAX_RE = re.compile(r"[|&;<>()$`\\*?\[\]{}~!#\n]")
+_SHELL_ONLY_COMMANDS = frozenset(
+    {
+        ".",
+        "alias",
+        "case",
+        "cd",
+        "command",
+        "echo",
+        "eval",
+        "exec",
+        "exit",
+        "export",
+        "for",
+        "if",
+        "read",
+        "set",
+        "shift",
+        "source",
+        "trap",
+        "type",
+        "ulimit",
+        "umask",
+        "unset",
+        "until",
+        "wait",
+        "while",
+    }
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _split_shell_command(command: str) -> Optional[Tuple[str, ...]]:
+    """
+    Split a shell command into arguments if it can run without a shell.
+
+    Args:
+        command: The shell command with variables substituted
+
+    Returns:
+        The argument vector, or None if the command needs a shell
+    """
+    if _SHELL_SYNTAX_RE.search(command):
+        return None
+    try:
+        argv = tuple(shlex.split(command))
+    except ValueError:
+        return None
+    if not argv or argv[0] in _SHELL_ONLY_COMMANDS or "=" in argv[0]:
+        return None
+    return argv
+
+
+def _run_shell_command(command: str) -> subprocess.CompletedProcess:
+    """
+    Run a shell code block, skipping the shell for simple commands.
+
+    Args:
+        command: The shell command with variables substituted
+
+    Returns:
+        The completed process with captured text output
+    """
+    argv = _split_shell_command(command)
+    if argv is not None:
+        try:
+            return subprocess.run(argv, capture_output=True, text=True)
+        except OSError:
+            # Not an executable program, let the shell report it
+            pass
+    return subprocess.run(command, shell=True, capture_output=True, text=True)
+
+
 class StepStatus(Enum):
     """Enum representing the status of a step."""
 
@@ -94,42 +335,126 @@ class StepStatus(Enum):
     ABORTED = "ABORTED"
 
 
+# Status members bound at module level. Members are singletons, so the hot
+# paths compare them by identity.
+_PENDING = StepStatus.PENDING
+_RUNNING = StepStatus.RUNNING
+_COMPLETED = StepStatus.COMPLETED
+_WAITING_FOR_MANUAL = StepStatus.WAITING_FOR_MANUAL
+_ABORTED = StepStatus.ABORTED
+
+# Display order of step statuses when sorting by status, others sort last
+_STATUS_SORT_ORDER = {
+    StepStatus.RUNNING.value: 0,
+    StepStatus.WAITING_FOR_MANUAL.value: 1,
+    StepStatus.PENDING.value: 2,
+}
+
+# Display strings of step statuses, keyed by both member and value
+_STATUS_DISPLAY: Dict[Union[StepStatus, str], str] = {
+    StepStatus.PENDING: "PENDING",
+    StepStatus.RUNNING: "RUNNING",
+    StepStatus.COMPLETED: "COMPLETED",
+    StepStatus.WAITING_FOR_MANUAL: "WAITING",
+    StepStatus.ABORTED: "ABORTED",
+}
+_STATUS_DISPLAY.update({status.value: _STATUS_DISPLAY[status] for status in StepStatus})
+
+
+@functools.lru_cache(maxsize=None)
+def _status_colors() -> Dict[StepStatus, int]:
+    """Get the curses color of each step status, built on first use."""
+    import curses
+
+    return {
+        StepStatus.PENDING: curses.COLOR_WHITE,
+        StepStatus.RUNNING: curses.COLOR_GREEN,
+        StepStatus.COMPLETED: curses.COLOR_BLUE,
+        StepStatus.WAITING_FOR_MANUAL: curses.COLOR_YELLOW,
+        StepStatus.ABORTED: curses.COLOR_RED,
+    }
+
+
+# Marks a step variable that is not defined, None being a valid value
+_UNSET = object()
+
+# Step variable names exposed to code blocks, mapped to Step attributes
+_STEP_VARIABLE_ATTRS = {
+    "stepId": "step_id",
+    "name": "name",
+    "trackId": "track_id",
+    "description": "description",
+    "taskTypes": "task_types",
+    "taskFractions": "task_fractions",
+}
+
+# Duration variables, only defined when the step has a duration and the value
+# is set
+_STEP_DURATION_ATTRS = {
+    "durationSeconds": "duration_seconds",
+    "minSeconds": "min_seconds",
+    "maxSeconds": "max_seconds",
+    "defaultSeconds": "default_seconds",
+}
+
+
 class StepVariables:
     """Class to hold step variables for code execution."""
 
+    __slots__ = ("_step",)
+
     def __init__(self, step: "Step"):
-        """Initialize step variables from a Step object."""
-        self.stepId = step.step_id
-        self.name = step.name
-        self.trackId = step.track_id
-        self.description = step.description
-        self.status = step.status.value
+        """Initialize step variables reading from a Step object."""
+        self._step = step
+
+    def __getattr__(self, name: str) -> Any:
+        """Read a step variable from the current state of the step."""
+        value = self.get(name, _UNSET)
+        if value is _UNSET:
+            raise AttributeError(name)
+        return value
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """
+        Read a step variable without raising if it is not defined.
+
+        Args:
+            name: The variable name
+            default: The value to return if the variable is not defined
 
-        # Add task types and fractions
-        self.taskTypes = step.task_types
-        self.taskFractions = step.task_fractions
+        Returns:
+            The variable value, or the default
+        """
+        step = self._step
+        attr = _STEP_VARIABLE_ATTRS.get(name)
+        if attr is not None:
+            return getattr(step, attr)
+        if name == "status":
+            return step.status.value
 
         # Add duration information if available
         if step.duration_type:
-            self.durationType = step.duration_type.value
-            if step.duration_seconds is not None:
-                self.durationSeconds = step.duration_seconds
-            if step.min_seconds is not None:
-                self.minSeconds = step.min_seconds
-            if step.max_seconds is not None:
-                self.maxSeconds = step.max_seconds
-            if step.default_seconds is not None:
-                self.defaultSeconds = step.default_seconds
+            if name == "durationType":
+                return step.duration_type.value
+            attr = _STEP_DURATION_ATTRS.get(name)
+            if attr is not None:
+                value = getattr(step, attr)
+                if value is not None:
+                    return value
+
+        return default
 
 
 class Step:
     """Class representing a step in a program."""
 
     def __init__(self, step_data, track_id, batch_index=0):
-        self.step_id = step_data["stepId"]
+        # Ids and task names repeat across steps and are used as dict keys and
+        # in membership tests, so share one interned copy of each
+        self.step_id = sys.intern(step_data["stepId"])
         self.name = step_data["name"]
         self.description = step_data.get("description", "")
-        self.track_id = track_id
+        self.track_id = sys.intern(track_id) if track_id is not None else None
         self.batch_index = batch_index
         self.priority = step_data.get("priority", 100)
         self.expected_end_time = None
@@ -177,6 +502,17 @@ class Step:
                     )
                     self.manual_trigger_name = duration.get("triggerName")
 
+        # Duration kind and reciprocal durations, fixed for the life of the step
+        self._is_fixed = self.duration_type is DurationType.FIXED
+        self._is_variable = self.duration_type is DurationType.VARIABLE
+        self._is_indefinite = self.duration_type is DurationType.INDEFINITE
+        self._inv_duration_seconds = (
+            1.0 / self.duration_seconds if self.duration_seconds else 0.0
+        )
+        self._inv_default_seconds = (
+            1.0 / self.default_seconds if self.default_seconds else 0.0
+        )
+
         # Extract start trigger information
         start_trigger_data = step_data["startTrigger"]
 
@@ -193,33 +529,62 @@ class Step:
             self.start_triggers = None
             self.start_trigger = start_trigger_data
 
-        # Extract task types
+        # Whether any start trigger is manual, trigger types are fixed
+        if self.start_triggers is not None:
+            self._has_manual_trigger = any(
+                trigger.get("type") == "manual" for trigger in self.start_triggers
+            )
+        elif self.start_trigger is not None:
+            self._has_manual_trigger = self.start_trigger.get("type") == "manual"
+        else:
+            self._has_manual_trigger = False
+
+        # Specialize the start trigger checks once, trigger types are fixed
+        self._start_trigger_checks: List[TriggerCheck] = []
+        self._start_trigger_combine: Optional[Callable[[Any], bool]] = None
+        if self.start_triggers is not None and self.start_trigger_logic is not None:
+            self._start_trigger_checks = [
+                _make_trigger_check(trigger) for trigger in self.start_triggers
+            ]
+            if self.start_trigger_logic == "all":
+                self._start_trigger_combine = all  # ALL triggers must be satisfied
+            elif self.start_trigger_logic == "any":
+                self._start_trigger_combine = any  # ANY trigger can start the step
+        elif self.start_trigger is not None:
+            self._start_trigger_checks = [_make_trigger_check(self.start_trigger)]
+            self._start_trigger_combine = all
+
+        # Extract task types. task_fractions always has the same keys as
+        # task_types, so it doubles as the membership test for the list
         self.task_types = []
         self.task_fractions = {}  # Dictionary mapping task name to fraction
 
         # Handle backward compatibility with single task
         if "task" in step_data and step_data["task"]:
-            self.task_types.append(step_data["task"])
-            self.task_fractions[step_data["task"]] = 1.0
+            task = sys.intern(step_data["task"])
+            self.task_types.append(task)
+            self.task_fractions[task] = 1.0
 
         # Handle multiple tasks
         if "tasks" in step_data and step_data["tasks"]:
             for task in step_data["tasks"]:
-                if task not in self.task_types:
+                task = sys.intern(task)
+                if task not in self.task_fractions:
                     self.task_types.append(task)
                     self.task_fractions[task] = 1.0
 
         # Handle fractional task resources
         if "taskResources" in step_data and step_data["taskResources"]:
             for task_resource in step_data["taskResources"]:
-                task_name = task_resource["name"]
+                task_name = sys.intern(task_resource["name"])
                 fraction = task_resource["fraction"]
-                if task_name not in self.task_types:
+                if task_name not in self.task_fractions:
                     self.task_types.append(task_name)
                 self.task_fractions[task_name] = fraction
 
         # Check for code execution
         self.has_code = "codeBlock" in step_data
+        self.step_vars = StepVariables(self)  # Variables for code blocks
         self.code_type = None
         self.code_block = None
         if self.has_code:
@@ -250,35 +615,49 @@ class Step:
         self.code_executed = False
         self.code_error: Optional[str] = None
 
-    def to_dict(self):
-        return {
+        # Fields of to_dict that never change, split around the mutable ones
+        # to keep the key order
+        self._dict_head = {
             "stepId": self.step_id,
             "name": self.name,
             "description": self.description,
             "trackId": self.track_id,
             "batchIndex": self.batch_index,
             "priority": self.priority,
-            "status": self.status.value,
-            "startTime": self.start_time.isoformat() if self.start_time else None,
-            "endTime": self.end_time.isoformat() if self.end_time else None,
-            "expectedEndTime": (
-                self.expected_end_time.isoformat() if self.expected_end_time else None
-            ),
-            "progress": self.progress,
-            "abortReason": self.abort_reason,
+        }
+        self._dict_tail = {
             "taskTypes": self.task_types,
             "taskFractions": self.task_fractions,
             "manualTriggerName": self.manual_trigger_name,
         }
 
+    def to_dict(self):
+        result = self._dict_head.copy()
+        result["status"] = self.status.value
+        result["startTime"] = (
+            _isoformat_timestamp(self.start_time) if self.start_time else None
+        )
+        result["endTime"] = (
+            _isoformat_timestamp(self.end_time) if self.end_time else None
+        )
+        result["expectedEndTime"] = (
+            _isoformat_timestamp(self.expected_end_time)
+            if self.expected_end_time
+            else None
+        )
+        result["progress"] = self.progress
+        result["abortReason"] = self.abort_reason
+        result.update(self._dict_tail)
+        return result
+
     def start(self, current_time: float) -> None:
         """Start the step."""
         self.status = StepStatus.RUNNING
         self.start_time = current_time
 
-        if self.duration_type == "fixed":
+        if self._is_fixed:
             self.expected_end_time = current_time + self.duration_seconds
-        elif self.duration_type == "variable":
+        elif self._is_variable:
             self.expected_end_time = current_time + self.default_seconds
         else:
             self.expected_end_time = None
@@ -293,8 +672,7 @@ class Step:
             return
 
         try:
-            # Create step variables for substitution
-            step_vars = StepVariables(self)
+            step_vars = self.step_vars
 
             # Replace variables in the code
             code_with_vars = self._substitute_variables(self.code_block, step_vars)
@@ -304,13 +682,11 @@ class Step:
                 local_vars = {}
                 # Add step variables to local_vars
                 local_vars["rhyl"] = step_vars
-                exec(code_with_vars, globals(), local_vars)
+                exec(_compile_python_code(code_with_vars), globals(), local_vars)
                 self.code_result = local_vars
             elif self.code_type == "shell":
                 # Execute shell command with variable substitution
-                result = subprocess.run(
-                    code_with_vars, shell=True, capture_output=True, text=True
-                )
+                result = _run_shell_command(code_with_vars)
                 self.code_result = {
                     "stdout": result.stdout,
                     "stderr": result.stderr,
@@ -332,17 +708,7 @@ class Step:
         Returns:
             The code with variables substituted
         """
-        # Find all {rhyl.variable} patterns
-        pattern = r"\{rhyl\.([a-zA-Z0-9_]+)\}"
-
-        def replace_var(match):
-            var_name = match.group(1)
-            if hasattr(step_vars, var_name):
-                return str(getattr(step_vars, var_name))
-            return match.group(0)  # Return the original if not found
-
-        # Replace all matches
-        return re.sub(pattern, replace_var, code)
+        return _substitute_rhyl_variables(code, step_vars)
 
     def complete(self, current_time: float) -> None:
         """Complete the step."""
@@ -351,7 +717,7 @@ class Step:
 
     def abort(self, current_time: float) -> None:
         """Abort the step."""
-        if self.status != StepStatus.RUNNING:
+        if self.status is not _RUNNING:
             return
 
         self.status = StepStatus.ABORTED
@@ -359,7 +725,7 @@ class Step:
 
     def can_be_aborted(self) -> bool:
         """Check if the step can be aborted."""
-        return self.status == StepStatus.RUNNING
+        return self.status is _RUNNING
 
     def is_ready_to_start(
         self,
@@ -372,127 +738,55 @@ class Step:
         if aborted_steps is None:
             aborted_steps = set()
 
-        if (
-            self.status != StepStatus.PENDING
-            and self.status != StepStatus.WAITING_FOR_MANUAL
-        ):
+        if self.status is not _PENDING and self.status is not _WAITING_FOR_MANUAL:
             return False
 
-        if self.status == StepStatus.WAITING_FOR_MANUAL:
+        if self.status is _WAITING_FOR_MANUAL:
             return True
 
-        # Handle multiple triggers
-        if self.start_triggers is not None and self.start_trigger_logic is not None:
-            trigger_results = []
-
-            for trigger in self.start_triggers:
-                trigger_ready = self._evaluate_single_trigger(
-                    trigger,
-                    completed_steps,
-                    program_start_time,
-                    current_time,
-                    aborted_steps,
-                )
-                trigger_results.append(trigger_ready)
-
-            if self.start_trigger_logic == "all":
-                return all(trigger_results)  # ALL triggers must be satisfied
-            elif self.start_trigger_logic == "any":
-                return any(trigger_results)  # ANY trigger can start the step
-            else:
-                return False  # Unknown logic
-
-        # Handle single trigger (backward compatibility)
-        elif self.start_trigger is not None:
-            return self._evaluate_single_trigger(
-                self.start_trigger,
-                completed_steps,
-                program_start_time,
-                current_time,
-                aborted_steps,
-            )
-
-        return False
-
-    def _evaluate_single_trigger(
-        self,
-        trigger: Dict[str, Any],
-        completed_steps: Set[str],
-        program_start_time: float,
-        current_time: float,
-        aborted_steps: Set[str],
-    ) -> bool:
-        """Evaluate a single trigger condition."""
-        start_trigger_type = trigger.get("type")
-
-        if start_trigger_type == "programStart":
-            return True
-        elif start_trigger_type == "programStartOffset":
-            # Parse offset with flexible time format
-            offset_value = trigger.get("offsetSeconds", 0)
-            offset_seconds = parse_time_string(offset_value)
-            return (current_time - program_start_time) >= offset_seconds
-        elif start_trigger_type == "afterStep":
-            ref_step_id = trigger.get("stepId")
-            return ref_step_id in completed_steps
-        elif start_trigger_type == "afterStepWithBuffer":
-            ref_step_id = trigger.get("stepId")
-            # Parse buffer with flexible time format
-            buffer_value = trigger.get("bufferSeconds", 0)
-            buffer_seconds = parse_time_string(buffer_value)
-
-            # Check if the referenced step is completed and the buffer time has passed
-            if ref_step_id in completed_steps:
-                return True
+        # Unknown multi-trigger logic, or no trigger at all
+        if self._start_trigger_combine is None:
             return False
-        elif start_trigger_type == "manual":
-            return False
-        elif start_trigger_type == "onAbort":
-            ref_step_id = trigger.get("stepId")
-            return ref_step_id in aborted_steps
 
-        return False
+        return self._start_trigger_combine(
+            check(completed_steps, aborted_steps, program_start_time, current_time)
+            for check in self._start_trigger_checks
+        )
 
     def is_ready_to_complete(self, current_time: float) -> bool:
         """Check if the step is ready to complete based on its duration."""
-        if self.status != StepStatus.RUNNING:
+        if self.status is not _RUNNING:
             return False
 
-        if self.duration_type == "fixed":
+        if self._is_fixed:
             if self.expected_end_time is None:
                 return False
             # Add small epsilon for floating point precision
             # If we're within 0.05 seconds of completion, complete it
             return current_time >= (self.expected_end_time - 0.05)
-        elif self.duration_type == "variable":
-            # For variable duration, we check if we've reached the minimum duration
-            if self.start_time is None or self.min_seconds is None:
-                return False
-            return current_time >= (self.start_time + self.min_seconds)
-        elif self.duration_type == "indefinite":
-            # Indefinite steps are never automatically completed
-            return False
 
+        # Variable and indefinite steps are ended manually, or by the runner
+        # once their expected end time has passed
         return False
 
     def must_complete(self, current_time: float) -> bool:
         """Check if the step must be completed (reached max duration)."""
-        if self.status != StepStatus.RUNNING:
+        if self.status is not _RUNNING:
             return False
 
-        if self.duration_type == "variable":
+        if self._is_variable:
             return current_time >= (self.start_time + self.max_seconds)
 
         return False
 
     def get_progress(self, current_time: float) -> float:
         """Get the progress of the step as a percentage (0-100)."""
-        if self.status == StepStatus.PENDING:
+        if self.status is _PENDING:
             return 0.0
-        elif self.status == StepStatus.COMPLETED:
+        elif self.status is _COMPLETED:
             return 100.0
-        elif self.status == StepStatus.RUNNING:
-            if self.duration_type == "indefinite":
+        elif self.status is _RUNNING:
+            if self._is_indefinite:
                 # For indefinite steps, we don't show progress
                 return -1.0
 
@@ -504,31 +798,26 @@ class Step:
                 return 0.0
 
             elapsed = current_time - self.start_time
-            if self.duration_type == "fixed":
-                if self.duration_seconds is None or self.duration_seconds == 0:
+            if self._is_fixed:
+                if not self._inv_duration_seconds:
                     logging.warning(
                         f"Step {self.step_id} has invalid duration_seconds: {self.duration_seconds}"
                     )
                     return 0.0
-                progress = (elapsed / self.duration_seconds) * 100.0
-                # Debug: Store values for display
-                self._debug_elapsed = elapsed
-                self._debug_duration = self.duration_seconds
-                self._debug_progress = progress
-                return min(100.0, progress)
-            elif self.duration_type == "variable":
-                if self.default_seconds is None or self.default_seconds == 0:
+                return min(100.0, elapsed * self._inv_duration_seconds * 100.0)
+            elif self._is_variable:
+                if not self._inv_default_seconds:
                     logging.warning(
                         f"Step {self.step_id} has invalid default_seconds: {self.default_seconds}"
                     )
                     return 0.0
-                return min(100.0, (elapsed / self.default_seconds) * 100.0)
+                return min(100.0, elapsed * self._inv_default_seconds * 100.0)
 
         return 0.0
 
     def get_remaining_time(self, current_time: float) -> Optional[float]:
         """Get the remaining time in seconds."""
-        if self.status != StepStatus.RUNNING:
+        if self.status is not _RUNNING:
             return None
 
         if self.expected_end_time is None:
@@ -545,15 +834,7 @@ class Step:
 
     def has_manual_trigger(self) -> bool:
         """Check if this step has any manual triggers."""
-        # Handle multiple triggers
-        if self.start_triggers is not None:
-            return any(
-                trigger.get("type") == "manual" for trigger in self.start_triggers
-            )
-        # Handle single trigger
-        elif self.start_trigger is not None:
-            return self.start_trigger.get("type") == "manual"
-        return False
+        return self._has_manual_trigger
 
 
 def parse_time_string(time_str: str) -> float:
@@ -577,28 +858,38 @@ def parse_time_string(time_str: str) -> float:
     if isinstance(time_str, (int, float)):
         return float(time_str)
 
-    # If it's just a number, assume seconds
-    if str(time_str).isdigit():
-        return float(time_str)
+    return _parse_time_str_cached(str(time_str))
 
-    # Parse complex time strings like "1h20m30s"
-    total_seconds = 0
 
-    # Find all hour, minute, and second components
-    hour_match = re.search(r"(\d+)h", str(time_str))
-    if hour_match:
-        total_seconds += int(hour_match.group(1)) * 3600
+@functools.lru_cache(maxsize=1024)
+def _parse_time_str_cached(time_str: str) -> float:
+    """
+    Parse a time string into seconds, caching the result.
 
-    minute_match = re.search(r"(\d+)m", str(time_str))
-    if minute_match:
-        total_seconds += int(minute_match.group(1)) * 60
+    Trigger offsets are re-evaluated on every update, and the same few strings
+    come up again and again.
 
-    second_match = re.search(r"(\d+)s", str(time_str))
-    if second_match:
-        total_seconds += int(second_match.group(1))
+    Args:
+        time_str: The time string to parse
 
-    # If no units were found but it's not a pure digit, try to convert directly
-    if total_seconds == 0 and not str(time_str).isdigit():
+    Returns:
+        The time in seconds
+    """
+    # If it's just a number, assume seconds
+    if time_str.isdigit():
+        return float(time_str)
+
+    # Parse complex time strings like "1h20m30s" in a single scan, using the
+    # first hour, minute and second component found
+    components: Dict[str, int] = {}
+    for match in _TIME_COMPONENT_RE.finditer(time_str):
+        components.setdefault(match.group(2), int(match.group(1)))
+    total_seconds = sum(
+        value * _TIME_UNIT_SECONDS[unit] for unit, value in components.items()
+    )
+
+    # If no units were found, try to convert directly
+    if total_seconds == 0:
         try:
             return float(time_str)
         except ValueError:
@@ -608,6 +899,68 @@ def parse_time_string(time_str: str) -> float:
     return total_seconds
 
 
+# Start trigger check: (completed_steps, aborted_steps, program_start_time,
+# current_time) -> whether the trigger is satisfied
+TriggerCheck = Callable[[Set[str], Set[str], float, float], bool]
+
+
+def _intern_step_id(step_id: Any) -> Any:
+    """Intern a referenced step ID so it shares the string used by its step."""
+    return sys.intern(step_id) if isinstance(step_id, str) else step_id
+
+
+def _make_trigger_check(trigger: Dict[str, Any]) -> TriggerCheck:
+    """
+    Build the check for a single start trigger.
+
+    Args:
+        trigger: The start trigger definition
+
+    Returns:
+        A function evaluating the trigger condition
+    """
+    start_trigger_type = trigger.get("type")
+
+    if start_trigger_type == "programStart":
+
+        def check(completed_steps, aborted_steps, program_start_time, current_time):
+            return True
+
+    elif start_trigger_type == "programStartOffset":
+        # Parse offset with flexible time format
+        offset_seconds = parse_time_string(trigger.get("offsetSeconds", 0))
+
+        def check(completed_steps, aborted_steps, program_start_time, current_time):
+            return (current_time - program_start_time) >= offset_seconds
+
+    elif start_trigger_type in ("afterStep", "afterStepWithBuffer"):
+        # Only the referenced step's completion is checked here, buffers are
+        # applied by the runner
+        ref_step_id = _intern_step_id(trigger.get("stepId"))
+
+        def check(completed_steps, aborted_steps, program_start_time, current_time):
+            return ref_step_id in completed_steps
+
+    elif start_trigger_type == "onAbort":
+        ref_step_id = _intern_step_id(trigger.get("stepId"))
+
+        def check(completed_steps, aborted_steps, program_start_time, current_time):
+            return ref_step_id in aborted_steps
+
+    else:
+        # Manual and unknown triggers never start a step on their own
+
+        def check(completed_steps, aborted_steps, program_start_time, current_time):
+            return False
+
+    return check
+
+
+# A step's constrained task: (task type, max concurrent, fraction, actors
+# required, (actor type, capacity) of each available qualified actor type)
+ResourcePlanEntry = Tuple[str, Any, float, float, Tuple[Tuple[str, Any], ...]]
+
+
 class ProgramRunner:
     """Class for running a program."""
 
@@ -724,6 +1077,10 @@ class ProgramRunner:
 
         self.is_running = False
         self.program_start_time: Optional[float] = None
+        # program_start_time the monotonic clock was last anchored to, and the
+        # monotonic time corresponding to it
+        self._clock_start_time: Optional[float] = None
+        self._monotonic_start = 0.0
         self.current_time: float = 0.0
         self.status_message = "Program waiting for manual start. Press 's' to start."
 
@@ -733,39 +1090,144 @@ class ProgramRunner:
         self.steps: Dict[str, Step] = {}
         self.tracks: Dict[str, List[Step]] = {}
         self.manual_triggers: Dict[str, List[Step]] = {}
+        # IDs of steps that completed or aborted, kept by complete_step and
+        # abort_step for O(1) membership checks
         self.completed_steps: Set[str] = set()
         self.aborted_steps: Set[str] = set()
+        # Bumped whenever a step completes. A pending step waiting on another
+        # step's completion cannot become ready before the generation changes,
+        # so it is not re-checked until then.
+        self._completion_generation = 0
+        self._blocked_at_generation: Dict[str, int] = {}
+        # Bumped whenever a step completes or aborts, releasing its resources.
+        # A ready step stays ready, and resource usage only grows between
+        # releases, so a step that could not get its resources is not retried
+        # until the generation changes.
+        self._release_generation = 0
+        self._resource_blocked_at: Dict[str, int] = {}
+        # Number of steps currently COMPLETED, kept by complete_step and
+        # abort_step so update() need not scan every step
+        self._completed_count = 0
+        # Actors reserved by type for each running step, released on
+        # completion or abort
+        self._reserved_actors: Dict[str, Dict[str, float]] = {}
         # self.resource_usage will be initialized below during resource constraints setup
         self.sort_mode = SortMode.DEFAULT
         self.selected_step_index = 0
-        self.running_steps: List[str] = []  # Initialize running_steps as an empty list
+        # Bumped whenever a step changes status. Sorted display info is reused
+        # until the status version, current time or sort mode changes.
+        self._status_version = 0
+        self._display_info_key: Optional[Tuple[float, SortMode, int]] = None
+        self._display_info: List[Dict[str, Any]] = []
+        # Display info for all steps in definition order, rebuilt only when
+        # the status version changes. Only running steps change with time,
+        # their indices are kept so just those are refreshed on a new tick.
+        self._steps_info_version: Optional[int] = None
+        self._steps_info: List[Dict[str, Any]] = []
+        self._running_steps_info: List[Tuple[int, Step]] = []
+        # Upcoming event candidates (event_type, step, time) sorted by time,
+        # reused until a status change or the program (re)starts
+        self._upcoming_events_key: Optional[Tuple[int, bool, Optional[float]]] = None
+        self._upcoming_events: List[Tuple[str, Step, float]] = []
+        # Resource usage rows shown when no resource constraints are active
+        self._unconstrained_resource_display: Optional[List[Dict[str, Any]]] = None
+        # Resource and actor usage only change when a step starts, completes
+        # or is aborted, so their display rows are reused until the status
+        # version changes
+        self._resource_display_version: Optional[int] = None
+        self._resource_display: List[Dict[str, Any]] = []
+        self._actor_display_version: Optional[int] = None
+        self._actor_display: List[Dict[str, Any]] = []
+        # Readiness checks and start time estimates by start trigger type
+        self._ready_handlers: Dict[
+            str, Callable[[Step, Dict[str, Any], float], bool]
+        ] = {
+            "programStart": self._ready_program_start,
+            "absolute": self._ready_absolute,
+            "offset": self._ready_offset,
+            "programStartOffset": self._ready_program_start_offset,
+            "afterStep": self._ready_after_step,
+            "afterStepWithBuffer": self._ready_after_step,
+        }
+        self._estimate_handlers: Dict[
+            str,
+            Callable[
+                [Step, Dict[str, Any], Dict[str, Optional[float]]], Optional[float]
+            ],
+        ] = {
+            "programStart": self._estimate_program_start,
+            "programStartOffset": self._estimate_program_start_offset,
+            "afterStep": self._estimate_after_step,
+            "afterStepWithBuffer": self._estimate_after_step,
+        }
+        # Header lines above the steps table, reused until one of the values
+        # they show changes
+        self._header_display_key: Optional[Tuple[Any, ...]] = None
+        self._header_display: Dict[str, Any] = {}
+        # IDs of running steps in start order; a dict for O(1) removal
+        self.running_steps: Dict[str, None] = {}
         self.manually_triggered_steps: Set[str] = (
             set()
         )  # Initialize manually_triggered_steps as an empty set
         self.event_listeners: List[Any] = []  # Add event listeners list
 
-        self.command_queue: queue.Queue[str] = queue.Queue()
-
-        # Initialize tracks - will be populated later during step processing
-        tracks = program.get("tracks", [])
-        for track_data in tracks:
-            track_id = track_data.get("trackId")
-            if not track_id:
-                continue
-            # Initialize track as empty list of steps
-            self.tracks[track_id] = []
-
-        # Get the actors count (default to 1 if not specified)
-        self.actors = max(1, program.get("actors", 1))
+        # Commands as tuples, command strings are still accepted
+        self.command_queue: queue.Queue[Union[Command, str]] = queue.Queue()
 
-        # Collect all task types used in the program
+        # Initialize tracks and steps in a single pass over the program
+        # (replicates/batch_size already expanded), collecting the task types
+        # used along the way
         used_task_types = set()
+        manual_triggers = self.manual_triggers
+        # Tracks without an ID are added after all identified tracks
+        unidentified_tracks: Dict[Any, List[Step]] = {}
+        # Display name of each track ID, the first track with an ID wins
+        self._track_names: Dict[Any, str] = {}
         for track in program.get("tracks", []):
+            track_id = track.get("trackId")
+            track_steps = []
+            self._track_names.setdefault(track_id, track.get("name", "Unknown"))
+
             for step_data in track.get("steps", []):
                 task_type = step_data.get("task")
                 if task_type:
                     used_task_types.add(task_type)
 
+                step = Step(step_data, track_id)
+                self.steps[step_data.get("stepId")] = step
+                track_steps.append(step)
+
+                # Register manual triggers from duration triggerName
+                if step.manual_trigger_name:
+                    manual_triggers.setdefault(step.manual_trigger_name, []).append(
+                        step
+                    )
+
+                # Register manual start triggers from startTrigger.triggerName
+                if step.has_manual_trigger():
+                    start_trig = step.start_trigger or {}
+                    start_trigger_name = start_trig.get("triggerName")
+                    if start_trigger_name:
+                        step.manual_start_trigger_name = start_trigger_name
+                        trigger_steps = manual_triggers.setdefault(
+                            start_trigger_name, []
+                        )
+                        if step not in trigger_steps:
+                            trigger_steps.append(step)
+                    elif not step.manual_trigger_name:
+                        fallback_name = f"start-{step.step_id}"
+                        step.manual_start_trigger_name = fallback_name
+                        manual_triggers.setdefault(fallback_name, []).append(step)
+
+            if track_id:
+                self.tracks[track_id] = track_steps
+            else:
+                unidentified_tracks[track_id] = track_steps
+        self.tracks.update(unidentified_tracks)
+
+        # Get the actors count (default to 1 if not specified)
+        self.actors = max(1, program.get("actors", 1))
+
         # Initialize resource constraints
         for constraint in program.get("resourceConstraints", []):
             task_type = constraint.get("task")
@@ -789,42 +1251,70 @@ class ProgramRunner:
                 if not self.qualified_actor_types[task]:
                     self.qualified_actor_types[task] = list(self.actor_types.keys())
 
-        # Initialize steps (replicates/batch_size already expanded)
-        for track in program.get("tracks", []):
-            track_id = track.get("trackId")
-            track_steps = []
+        # Steps sorted by priority once; steps never return to PENDING, so
+        # start_ready_steps only has to prune this list as steps start
+        self._unstarted_steps = sorted(self.steps.values(), key=lambda s: s.priority)
+
+        # Running steps by expected end time, so complete_finished_steps only
+        # looks at the steps that are due. Entries are (expected end time,
+        # definition index, step); the index breaks ties and keeps completions
+        # in definition order
+        self._deadlines: List[Tuple[float, int, Step]] = []
+        self._step_index = {step_id: i for i, step_id in enumerate(self.steps)}
+
+        # First step registered under each (trigger name, step ID), for
+        # triggering a single step without scanning the trigger's step list
+        self._manual_trigger_steps: Dict[Tuple[str, str], Step] = {}
+        for trigger_name, trigger_steps in self.manual_triggers.items():
+            for step in trigger_steps:
+                self._manual_trigger_steps.setdefault(
+                    (trigger_name, step.step_id), step
+                )
 
-            for step_data in track.get("steps", []):
-                step_id = step_data.get("stepId")
+        # Capacity of each actor type, resolved into the resource plans below
+        self._actor_capacity: Dict[str, Any] = {
+            actor_type: info["count"] for actor_type, info in self.actor_types.items()
+        }
 
-                step = Step(step_data, track_id)
-                self.steps[step_id] = step
-                track_steps.append(step)
+        # Resolve each step's constrained tasks once, constraints are fixed now
+        self._resource_plans: Dict[str, List[ResourcePlanEntry]] = {
+            step_id: self._build_resource_plan(step)
+            for step_id, step in self.steps.items()
+        }
 
-                # Register manual triggers from duration triggerName
-                if step.manual_trigger_name:
-                    if step.manual_trigger_name not in self.manual_triggers:
-                        self.manual_triggers[step.manual_trigger_name] = []
-                    self.manual_triggers[step.manual_trigger_name].append(step)
+    def _build_resource_plan(self, step: Step) -> List[ResourcePlanEntry]:
+        """
+        Resolve the resource constraints that apply to a step.
 
-                # Register manual start triggers from startTrigger.triggerName
-                if step.has_manual_trigger():
-                    start_trig = step.start_trigger or {}
-                    start_trigger_name = start_trig.get("triggerName")
-                    if start_trigger_name:
-                        step.manual_start_trigger_name = start_trigger_name
-                        if start_trigger_name not in self.manual_triggers:
-                            self.manual_triggers[start_trigger_name] = []
-                        if step not in self.manual_triggers[start_trigger_name]:
-                            self.manual_triggers[start_trigger_name].append(step)
-                    elif not step.manual_trigger_name:
-                        fallback_name = f"start-{step.step_id}"
-                        step.manual_start_trigger_name = fallback_name
-                        if fallback_name not in self.manual_triggers:
-                            self.manual_triggers[fallback_name] = []
-                        self.manual_triggers[fallback_name].append(step)
+        Args:
+            step: The step to resolve
 
-            self.tracks[track_id] = track_steps
+        Returns:
+            One (task type, max concurrent, fraction, actors required, qualified
+            actors) entry per constrained task type of the step. Qualified
+            actors pairs each qualified actor type that exists with its
+            capacity, in the order they were listed.
+        """
+        actor_capacity = self._actor_capacity
+        plan = []
+        for task_type in step.task_types:
+            if task_type in self.resource_constraints:
+                fraction = step.task_fractions.get(task_type, 1.0)
+                qualified_actors = tuple(
+                    (actor_type, actor_capacity[actor_type])
+                    for actor_type in self.qualified_actor_types.get(task_type, [])
+                    if actor_type in actor_capacity
+                )
+                plan.append(
+                    (
+                        task_type,
+                        self.resource_constraints[task_type],
+                        fraction,
+                        self.actor_requirements.get(task_type, 1.0) * fraction,
+                        qualified_actors,
+                    )
+                )
+        return plan
 
     def start(self) -> None:
         """Start the program execution."""
@@ -869,11 +1359,17 @@ class ProgramRunner:
             return
 
         # Update current time
-        if self.program_start_time is not None:
-            real_elapsed = time.time() - self.program_start_time
-            self.current_time = self.program_start_time + (
-                real_elapsed * self.time_scale
-            )
+        program_start_time = self.program_start_time
+        if program_start_time is not None:
+            if program_start_time != self._clock_start_time:
+                # Anchor the monotonic clock to the (wall clock) start time,
+                # elapsed time is then immune to system clock adjustments
+                self._clock_start_time = program_start_time
+                self._monotonic_start = time.monotonic() - (
+                    time.time() - program_start_time
+                )
+            real_elapsed = time.monotonic() - self._monotonic_start
+            self.current_time = program_start_time + (real_elapsed * self.time_scale)
 
         # Start steps that are ready
         self.start_ready_steps(self.current_time)
@@ -882,50 +1378,68 @@ class ProgramRunner:
         self.complete_finished_steps()
 
         # Check if all steps are completed
-        if all(step.status == StepStatus.COMPLETED for step in self.steps.values()):
+        if self._completed_count == len(self.steps):
             self.is_running = False
             self.status_message = "Program execution completed."
 
     def process_commands(self) -> None:
         """Process commands from the command queue."""
-        while not self.command_queue.empty():
+        # Drain at most MAX_COMMANDS_PER_UPDATE commands so a flood of input
+        # cannot stall the scheduler; the rest are handled on the next update
+        for _ in range(MAX_COMMANDS_PER_UPDATE):
             try:
                 command = self.command_queue.get_nowait()
-                if command == "start_program":
-                    self.is_running = True
-                    self.program_started = True
-                    # Initialize program start time if not already set
-                    if self.program_start_time is None:
-                        self.program_start_time = time.time()
-                        self.current_time = self.program_start_time
-                    self.status_message = "Program started manually."
-                elif command.startswith("trigger:"):
-                    parts = command.split(":", 2)
-                    if len(parts) == 3:
-                        trigger_name, step_id = parts[1], parts[2]
-                        self.trigger_manual_step(trigger_name, step_id)
-                    else:
-                        trigger_name = parts[1]
-                        self.trigger_manual_step(trigger_name)
-                elif command.startswith("abort:"):
-                    step_id = command.split(":", 1)[1]
-                    if step_id in self.steps and self.steps[step_id].can_be_aborted():
-                        self.abort_step(self.steps[step_id], self.current_time)
             except queue.Empty:
                 break
 
+            if isinstance(command, str):
+                command = parse_command(command)
+                if command is None:
+                    continue
+
+            kind = command[0]
+            if kind == "start_program":
+                self.is_running = True
+                self.program_started = True
+                # Initialize program start time if not already set
+                if self.program_start_time is None:
+                    self.program_start_time = time.time()
+                    self.current_time = self.program_start_time
+                self.status_message = "Program started manually."
+            elif kind == "trigger":
+                self.trigger_manual_step(*command[1:])
+            elif kind == "abort":
+                step_id = command[1]
+                if step_id in self.steps and self.steps[step_id].can_be_aborted():
+                    self.abort_step(self.steps[step_id], self.current_time)
+
     def start_ready_steps(self, current_time: float) -> None:
         """Start steps that are ready to start."""
-        # Sort steps by priority (lower number = higher priority)
+        # Steps in priority order (lower number = higher priority), dropping
+        # those that have left PENDING/WAITING_FOR_MANUAL since the last call.
         # Include WAITING_FOR_MANUAL steps so they can be started after user triggers them
         pending_steps = [
             step
-            for step in self.steps.values()
-            if step.status in (StepStatus.PENDING, StepStatus.WAITING_FOR_MANUAL)
+            for step in self._unstarted_steps
+            if step.status is _PENDING or step.status is _WAITING_FOR_MANUAL
         ]
-        pending_steps.sort(key=lambda s: s.priority)
-
+        self._unstarted_steps = pending_steps
+
+        generation = self._completion_generation
+        blocked_at_generation = self._blocked_at_generation
+        resource_plans = self._resource_plans
+        step_index = self._step_index
+        release_generation = self._release_generation
+        resource_blocked_at = self._resource_blocked_at
         for step in pending_steps:
+            if (
+                step.status is _PENDING
+                and blocked_at_generation.get(step.step_id) == generation
+            ):
+                continue
+            if resource_blocked_at.get(step.step_id) == release_generation:
+                continue
+
             if self.is_step_ready_to_start(step, current_time):
                 # Check resource constraints and actor availability for each task type
                 can_start = True
@@ -933,70 +1447,62 @@ class ProgramRunner:
                     {}
                 )  # Track how many actors of each type are needed
 
-                for task_type in step.task_types:
-                    if task_type in self.resource_constraints:
-                        max_concurrent = self.resource_constraints[task_type]
-                        fraction = step.task_fractions.get(task_type, 1.0)
-                        current_usage = self.resource_usage.get(task_type, 0.0)
+                resource_plan = resource_plans[step.step_id]
+
+                for (
+                    task_type,
+                    max_concurrent,
+                    fraction,
+                    actors_required,
+                    qualified_actors,
+                ) in resource_plan:
+                    current_usage = self.resource_usage.get(task_type, 0.0)
 
-                        # Check if adding this step's fractional usage would exceed the constraint
-                        if current_usage + fraction > max_concurrent:
-                            can_start = False
-                            break
+                    # Check if adding this step's fractional usage would exceed the constraint
+                    if current_usage + fraction > max_concurrent:
+                        can_start = False
+                        break
+
+                    # Check actor constraints
+                    if not qualified_actors:
+                        # If no qualified types are available, can't run the task
+                        can_start = False
+                        break
 
-                        # Check actor constraints
-                        actors_required = (
-                            self.actor_requirements.get(task_type, 1.0) * fraction
+                    # Find the best actor type to assign (one with lowest current usage)
+                    best_actor_type = None
+                    best_available_capacity = 0
+
+                    for actor_type, total_capacity in qualified_actors:
+                        current_usage = self.actor_usage_by_type.get(actor_type, 0.0)
+                        pending_usage = required_actors_by_type.get(actor_type, 0.0)
+                        available_capacity = (
+                            total_capacity - current_usage - pending_usage
                         )
-                        qualified_types = self.qualified_actor_types.get(task_type, [])
-
-                        if not qualified_types:
-                            # If no qualified types specified, can't run the task
-                            can_start = False
-                            break
-
-                        # Find the best actor type to assign (one with lowest current usage)
-                        best_actor_type = None
-                        best_available_capacity = 0
-
-                        for actor_type in qualified_types:
-                            if actor_type not in self.actor_types:
-                                continue
-
-                            total_capacity = self.actor_types[actor_type]["count"]
-                            current_usage = self.actor_usage_by_type.get(
-                                actor_type, 0.0
-                            )
-                            pending_usage = required_actors_by_type.get(actor_type, 0.0)
-                            available_capacity = (
-                                total_capacity - current_usage - pending_usage
-                            )
-
-                            if (
-                                available_capacity >= actors_required
-                                and available_capacity > best_available_capacity
-                            ):
-                                best_actor_type = actor_type
-                                best_available_capacity = available_capacity
-
-                        if best_actor_type is None:
-                            # No qualified actor type has enough capacity
-                            can_start = False
-                            break
-
-                        # Reserve the actors
-                        if best_actor_type not in required_actors_by_type:
-                            required_actors_by_type[best_actor_type] = 0.0
-                        required_actors_by_type[best_actor_type] += actors_required
+
+                        if (
+                            available_capacity >= actors_required
+                            and available_capacity > best_available_capacity
+                        ):
+                            best_actor_type = actor_type
+                            best_available_capacity = available_capacity
+
+                    if best_actor_type is None:
+                        # No qualified actor type has enough capacity
+                        can_start = False
+                        break
+
+                    # Reserve the actors
+                    if best_actor_type not in required_actors_by_type:
+                        required_actors_by_type[best_actor_type] = 0.0
+                    required_actors_by_type[best_actor_type] += actors_required
 
                 if can_start:
                     # Update resource usage for each task type
-                    for task_type in step.task_types:
-                        if task_type in self.resource_constraints:
-                            fraction = step.task_fractions.get(task_type, 1.0)
-                            self.resource_usage[task_type] = (
-                                self.resource_usage.get(task_type, 0.0) + fraction
-                            )
+                    for task_type, _, fraction, _, _ in resource_plan:
+                        self.resource_usage[task_type] = (
+                            self.resource_usage.get(task_type, 0.0) + fraction
+                        )
 
                     # Update actor usage by type
                     total_actor_usage = 0.0
@@ -1009,31 +1515,41 @@ class ProgramRunner:
                     # Update total actor usage for display
                     self.actor_usage += total_actor_usage
 
+                    # Remember the actors reserved, to release exactly these
+                    self._reserved_actors[step.step_id] = required_actors_by_type
+
                     step.start(current_time)
+                    self._status_version += 1
 
                     # Set expected end time for fixed duration steps
                     if (
-                        step.duration_type == DurationType.FIXED
+                        step.duration_type is DurationType.FIXED
                         and step.duration_seconds is not None
                     ):
                         step.expected_end_time = current_time + step.duration_seconds
                     elif (
-                        step.duration_type == DurationType.VARIABLE
+                        step.duration_type is DurationType.VARIABLE
                         and step.default_seconds is not None
                     ):
                         step.expected_end_time = current_time + step.default_seconds
                     elif (
-                        step.duration_type == DurationType.INDEFINITE
+                        step.duration_type is DurationType.INDEFINITE
                         and step.default_seconds is not None
                     ):
                         step.expected_end_time = current_time + step.default_seconds
 
+                    if step.expected_end_time is not None:
+                        heapq.heappush(
+                            self._deadlines,
+                            (step.expected_end_time, step_index[step.step_id], step),
+                        )
+
                     # Execute code block if present
                     if step.has_code:
                         self.execute_code_block(step)
 
                     # Add to running steps
-                    self.running_steps.append(step.step_id)
+                    self.running_steps[step.step_id] = None
 
                     # Log the step start
                     logging.info(f"Started step {step.step_id}: {step.name}")
@@ -1042,61 +1558,73 @@ class ProgramRunner:
                     self.emit_event(
                         "step_started", {"step_id": step.step_id, "time": current_time}
                     )
+                else:
+                    resource_blocked_at[step.step_id] = release_generation
+            elif self._waits_on_step_completion(step):
+                blocked_at_generation[step.step_id] = generation
+
+    def _waits_on_step_completion(self, step: Step) -> bool:
+        """
+        Check if a step that is not ready is blocked on another step completing.
+
+        Args:
+            step: The step to check
+
+        Returns:
+            True if the step's trigger refers to a step that has not completed
+        """
+        trigger = step.start_trigger
+        if trigger.get("type") not in ("afterStep", "afterStepWithBuffer"):
+            return False
+        ref_step = self.steps.get(trigger["stepId"])
+        return ref_step is None or ref_step.status is not _COMPLETED
 
     def complete_finished_steps(self) -> None:
         """Complete steps that are finished."""
-        for step in self.steps.values():
-            if step.is_ready_to_complete(self.current_time):
-                self.complete_step(step, self.current_time)
-            # Aggressive completion: if remaining time displays as "< 0.1s", force complete
-            elif step.status == StepStatus.RUNNING:
-                remaining = step.get_remaining_time(self.current_time)
-                if remaining is not None and remaining < 0.1:
-                    logging.info(
-                        f"Force completing step {step.step_id} with {remaining:.3f}s remaining (< 0.1s threshold)"
-                    )
-                    self.complete_step(step, self.current_time)
-
-    def complete_step(self, step: Step, current_time: float) -> None:
-        """Complete a step."""
-        step.status = StepStatus.COMPLETED
-        step.end_time = current_time
-        step.progress = 1.0
+        current_time = self.current_time
+        deadlines = self._deadlines
+        # Aggressive completion: if remaining time displays as "< 0.1s", the
+        # step is due, so pop everything within that threshold
+        due_steps = []
+        while deadlines and deadlines[0][0] - current_time < _COMPLETION_THRESHOLD:
+            _, index, step = heapq.heappop(deadlines)
+            # Steps completed or aborted since they started are skipped
+            if step.status is _RUNNING:
+                due_steps.append((index, step))
+
+        # Complete in definition order, as a scan over all steps would
+        due_steps.sort(key=lambda entry: entry[0])
+        for _, step in due_steps:
+            if step.is_ready_to_complete(current_time):
+                self.complete_step(step, current_time)
+            else:
+                remaining = step.get_remaining_time(current_time)
+                logging.info(
+                    f"Force completing step {step.step_id} with {remaining:.3f}s remaining (< 0.1s threshold)"
+                )
+                self.complete_step(step, current_time)
 
-        # Calculate actor usage to free by type
-        freed_actors_by_type = {}
+    def _release_step_resources(self, step: Step) -> None:
+        """
+        Release the task usage and actors reserved when a step started.
 
-        # Decrement resource usage for each task type
-        for task_type in step.task_types:
-            if task_type in self.resource_constraints:
-                fraction = step.task_fractions.get(task_type, 1.0)
-                current_usage = self.resource_usage.get(task_type, 0.0)
-                # Ensure we don't go below zero due to rounding errors
-                self.resource_usage[task_type] = max(0.0, current_usage - fraction)
-
-                # Calculate actor usage for this task
-                actors_required = self.actor_requirements.get(task_type, 1.0) * fraction
-                qualified_types = self.qualified_actor_types.get(task_type, [])
-
-                # Find which actor type was actually used (choose the one with highest usage)
-                best_actor_type = None
-                best_usage = 0.0
-
-                for actor_type in qualified_types:
-                    if actor_type in self.actor_usage_by_type:
-                        current_usage = self.actor_usage_by_type[actor_type]
-                        if current_usage > best_usage:
-                            best_actor_type = actor_type
-                            best_usage = current_usage
+        Args:
+            step: The step whose resources to release
+        """
+        reserved_actors = self._reserved_actors.pop(step.step_id, None)
+        if reserved_actors is None:
+            # Never started, or already released
+            return
 
-                if best_actor_type:
-                    if best_actor_type not in freed_actors_by_type:
-                        freed_actors_by_type[best_actor_type] = 0.0
-                    freed_actors_by_type[best_actor_type] += actors_required
+        # Decrement resource usage for each task type
+        for task_type, _, fraction, _, _ in self._resource_plans[step.step_id]:
+            current_usage = self.resource_usage.get(task_type, 0.0)
+            # Ensure we don't go below zero due to rounding errors
+            self.resource_usage[task_type] = max(0.0, current_usage - fraction)
 
-        # Free actor usage by type
+        # Free the actors reserved for the step, by type
         total_freed = 0.0
-        for actor_type, usage in freed_actors_by_type.items():
+        for actor_type, usage in reserved_actors.items():
             current_usage = self.actor_usage_by_type.get(actor_type, 0.0)
             self.actor_usage_by_type[actor_type] = max(0.0, current_usage - usage)
             total_freed += usage
@@ -1104,9 +1632,24 @@ class ProgramRunner:
         # Update total actor usage for display
         self.actor_usage = max(0.0, self.actor_usage - total_freed)
 
+    def complete_step(self, step: Step, current_time: float) -> None:
+        """Complete a step."""
+        if step.status is not _COMPLETED:
+            self._completed_count += 1
+        step.status = StepStatus.COMPLETED
+        step.end_time = current_time
+        step.progress = 1.0
+        self._completion_generation += 1
+        self._release_generation += 1
+        self._status_version += 1
+
+        self._release_step_resources(step)
+
         # Remove from running steps
-        if step.step_id in self.running_steps:
-            self.running_steps.remove(step.step_id)
+        self.running_steps.pop(step.step_id, None)
+
+        # Add to completed steps
+        self.completed_steps.add(step.step_id)
 
         # Log the step completion
         logging.info(f"Completed step {step.step_id}: {step.name}")
@@ -1138,10 +1681,10 @@ class ProgramRunner:
 
         # If a specific step_id is provided, only trigger that step
         if step_id:
-            for step in self.manual_triggers[trigger_name]:
-                if step.step_id == step_id:
-                    self._trigger_step(step)
-                    return
+            step = self._manual_trigger_steps.get((trigger_name, step_id))
+            if step is not None:
+                self._trigger_step(step)
+                return
             self.status_message = (
                 f"Step with ID {step_id} not found for trigger {trigger_name}"
             )
@@ -1158,14 +1701,15 @@ class ProgramRunner:
         Args:
             step: The step to trigger
         """
-        if step.status == StepStatus.PENDING and step.has_manual_trigger():
+        if step.status is _PENDING and step.has_manual_trigger():
             step.set_waiting_for_manual()
+            self._status_version += 1
             self.status_message = f"Step {step.name} is now waiting to start."
-        elif step.status == StepStatus.RUNNING:
+        elif step.status is _RUNNING:
             # Check if step has a completable duration trigger first
             if (
-                step.duration_type == DurationType.VARIABLE
-                or step.duration_type == DurationType.INDEFINITE
+                step.duration_type is DurationType.VARIABLE
+                or step.duration_type is DurationType.INDEFINITE
             ):
                 self.complete_step(step, self.current_time)
                 self.status_message = f"Manually completed step: {step.name}"
@@ -1184,56 +1728,21 @@ class ProgramRunner:
             current_time: The current time
             reason: The reason for aborting the step
         """
+        if step.status is _COMPLETED:
+            self._completed_count -= 1
         step.status = StepStatus.ABORTED
         step.end_time = current_time
         step.abort_reason = reason
+        self._release_generation += 1
+        self._status_version += 1
 
-        # Calculate actor usage to free by type
-        freed_actors_by_type = {}
-
-        # Decrement resource usage for each task type
-        for task_type in step.task_types:
-            if task_type in self.resource_constraints:
-                fraction = step.task_fractions.get(task_type, 1.0)
-                current_usage = self.resource_usage.get(task_type, 0.0)
-                # Ensure we don't go below zero due to rounding errors
-                self.resource_usage[task_type] = max(0.0, current_usage - fraction)
-
-                # Calculate actor usage for this task
-                actors_required = self.actor_requirements.get(task_type, 1.0) * fraction
-                qualified_types = self.qualified_actor_types.get(task_type, [])
-
-                # Find which actor type was actually used (choose the one with highest usage)
-                best_actor_type = None
-                best_usage = 0.0
-
-                for actor_type in qualified_types:
-                    if actor_type in self.actor_usage_by_type:
-                        current_usage = self.actor_usage_by_type[actor_type]
-                        if current_usage > best_usage:
-                            best_actor_type = actor_type
-                            best_usage = current_usage
-
-                if best_actor_type:
-                    if best_actor_type not in freed_actors_by_type:
-                        freed_actors_by_type[best_actor_type] = 0.0
-                    freed_actors_by_type[best_actor_type] += actors_required
-
-        # Free actor usage by type
-        total_freed = 0.0
-        for actor_type, usage in freed_actors_by_type.items():
-            current_usage = self.actor_usage_by_type.get(actor_type, 0.0)
-            self.actor_usage_by_type[actor_type] = max(0.0, current_usage - usage)
-            total_freed += usage
-
-        # Update total actor usage for display
-        self.actor_usage = max(0.0, self.actor_usage - total_freed)
+        self._release_step_resources(step)
 
         # Remove from running steps
-        if step.step_id in self.running_steps:
-            self.running_steps.remove(step.step_id)
+        self.running_steps.pop(step.step_id, None)
 
-        # Add to aborted steps
+        # Move to aborted steps, a step is never both completed and aborted
+        self.completed_steps.discard(step.step_id)
         self.aborted_steps.add(step.step_id)
 
         # Log the step abortion
@@ -1254,7 +1763,8 @@ class ProgramRunner:
             {
                 "id": Trigger ID (for selection),
                 "name": Display name,
-                "type": Trigger type (program, start, end),
+                "type": Trigger type (program, start, end, abort),
+                "trigger_name": Manual trigger name (start and end only),
                 "step_id": Step ID (if applicable),
                 "step_name": Step name (if applicable),
                 "track_id": Track ID (if applicable)
@@ -1274,23 +1784,24 @@ class ProgramRunner:
         # Check for step triggers
         for trigger_name, steps in self.manual_triggers.items():
             for step in steps:
-                if step.status == StepStatus.PENDING and step.has_manual_trigger():
+                if step.status is _PENDING and step.has_manual_trigger():
                     available_triggers.append(
                         {
                             "id": f"start:{trigger_name}:{step.step_id}",
                             "name": f"Start: {step.name}",
                             "type": "start",
+                            "trigger_name": trigger_name,
                             "step_id": step.step_id,
                             "step_name": step.name,
                             "track_id": step.track_id,
                         }
                     )
-                elif step.status == StepStatus.RUNNING and (
-                    step.duration_type == "variable"
-                    or step.duration_type == "indefinite"
+                elif step.status is _RUNNING and (
+                    step.duration_type is DurationType.VARIABLE
+                    or step.duration_type is DurationType.INDEFINITE
                 ):
                     if (
-                        step.duration_type == "variable"
+                        step.duration_type is DurationType.VARIABLE
                         and step.get_progress(self.current_time)
                         < (step.min_seconds / step.default_seconds) * 100
                     ):
@@ -1300,6 +1811,7 @@ class ProgramRunner:
                             "id": f"end:{trigger_name}:{step.step_id}",
                             "name": f"End: {step.name}",
                             "type": "end",
+                            "trigger_name": trigger_name,
                             "step_id": step.step_id,
                             "step_name": step.name,
                             "track_id": step.track_id,
@@ -1310,11 +1822,12 @@ class ProgramRunner:
         for step_id, step in self.steps.items():
             if step.can_be_aborted():
                 track_id = step.track_id
-                track_name = self.program.get("tracks", [{}])[0].get("name", "Unknown")
-                for track in self.program.get("tracks", []):
-                    if track.get("trackId") == track_id:
-                        track_name = track.get("name", "Unknown")
-                        break
+                if track_id in self._track_names:
+                    track_name = self._track_names[track_id]
+                else:
+                    track_name = self.program.get("tracks", [{}])[0].get(
+                        "name", "Unknown"
+                    )
 
                 available_triggers.append(
                     {
@@ -1341,36 +1854,25 @@ class ProgramRunner:
                 return "< 0.1s"
             return f"{seconds:.1f}s"
 
-        hours, remainder = divmod(int(seconds), 3600)
-        minutes, secs = divmod(remainder, 60)
-
-        if hours > 0:
-            return f"{hours}h {minutes}m {secs}s"
-        elif minutes > 0:
-            return f"{minutes}m {secs}s"
-        else:
-            return f"{int(seconds)}s"
+        # From 10 seconds up only whole seconds are shown
+        return _format_whole_seconds(int(seconds))
 
     def get_step_display_info(self, step: Step) -> Dict[str, Any]:
         """Get display information for a step."""
         progress = step.get_progress(self.current_time)
         remaining = step.get_remaining_time(self.current_time)
 
-        # Debug: Add timing info to status for selected step
-        debug_info = ""
-        if hasattr(step, "_debug_elapsed") and step.status == StepStatus.RUNNING:
-            debug_info = f" [DBG: e={step._debug_elapsed:.1f}s d={step._debug_duration:.1f}s p={step._debug_progress:.1f}%]"
-
         return {
             "id": step.step_id,
             "step_id": step.step_id,  # Add for backward compatibility
-            "name": step.name + debug_info,
+            "name": step.name,
             "track": step.track_id,
             "status": step.status.value,
             "progress": progress,
             "remaining": (
                 self.format_time(remaining) if remaining is not None else "N/A"
             ),
+            "remaining_seconds": remaining,
             "task_type": (
                 step.task_types[0] if step.task_types else "N/A"
             ),  # Keep for backward compatibility
@@ -1382,8 +1884,7 @@ class ProgramRunner:
 
     def select_next_step(self) -> None:
         """Select the next step in the list."""
-        steps_info = [self.get_step_display_info(step) for step in self.steps.values()]
-        sorted_steps = self.sort_steps(steps_info)
+        sorted_steps = self._sorted_steps_display_info()
         if sorted_steps:
             self.selected_step_index = (self.selected_step_index + 1) % len(
                 sorted_steps
@@ -1394,8 +1895,7 @@ class ProgramRunner:
 
     def select_previous_step(self) -> None:
         """Select the previous step in the list."""
-        steps_info = [self.get_step_display_info(step) for step in self.steps.values()]
-        sorted_steps = self.sort_steps(steps_info)
+        sorted_steps = self._sorted_steps_display_info()
         if sorted_steps:
             self.selected_step_index = (self.selected_step_index - 1) % len(
                 sorted_steps
@@ -1406,79 +1906,215 @@ class ProgramRunner:
 
     def get_selected_step_id(self) -> Optional[str]:
         """Get the ID of the currently selected step."""
-        steps_info = [self.get_step_display_info(step) for step in self.steps.values()]
-        sorted_steps = self.sort_steps(steps_info)
+        return self._selected_step_id(self._sorted_steps_display_info())
+
+    def _selected_step_id(self, sorted_steps: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Get the ID of the selected step from already sorted display info.
+
+        Args:
+            sorted_steps: Display info for all steps, in display order
+
+        Returns:
+            The selected step ID, or None if there are no steps
+        """
         if not sorted_steps:
             return None
         if self.selected_step_index >= len(sorted_steps):
             self.selected_step_index = 0
         return sorted_steps[self.selected_step_index]["id"]
 
+    def _sorted_steps_display_info(self) -> List[Dict[str, Any]]:
+        """
+        Get display information for all steps in display order.
+
+        The result is rebuilt only when the current time, the sort mode or the
+        status of a step has changed since the last call. A new current time
+        alone only refreshes the running steps.
+
+        Returns:
+            Display info for all steps, sorted by the current sort mode
+        """
+        current_time = self.current_time
+        key = (current_time, self.sort_mode, self._status_version)
+        if key != self._display_info_key:
+            steps_info = self._steps_info
+            if self._steps_info_version != self._status_version:
+                steps_info = [
+                    self.get_step_display_info(step) for step in self.steps.values()
+                ]
+                self._running_steps_info = [
+                    (index, step)
+                    for index, step in enumerate(self.steps.values())
+                    if step.status is _RUNNING
+                ]
+                self._steps_info = steps_info
+                self._steps_info_version = self._status_version
+            elif current_time != self._display_info_key[0]:
+                # Only the progress and remaining time of running steps
+                # depend on the current time; refresh just those
+                for index, step in self._running_steps_info:
+                    info = steps_info[index]
+                    remaining = step.get_remaining_time(current_time)
+                    info["progress"] = step.get_progress(current_time)
+                    info["remaining"] = (
+                        self.format_time(remaining) if remaining is not None else "N/A"
+                    )
+                    info["remaining_seconds"] = remaining
+            # Hand out copies, the selection flag is set on these per call
+            self._display_info = self.sort_steps([dict(info) for info in steps_info])
+            self._display_info_key = key
+        return self._display_info
+
     def get_all_steps_display_info(self) -> List[Dict[str, Any]]:
         """Get display information for all steps."""
-        steps_info = [self.get_step_display_info(step) for step in self.steps.values()]
-        sorted_steps = self.sort_steps(steps_info)
+        sorted_steps = self._sorted_steps_display_info()
 
-        # Add selection indicator
-        selected_id = self.get_selected_step_id()
-        for step_info in sorted_steps:
+        # Add selection indicator to copies, so callers can't change the
+        # cached display info
+        selected_id = self._selected_step_id(sorted_steps)
+        steps_info = [dict(info) for info in sorted_steps]
+        for step_info in steps_info:
             step_info["selected"] = step_info["id"] == selected_id
 
-        return sorted_steps
+        return steps_info
 
     def get_resource_usage_display(self) -> List[Dict[str, Any]]:
         """Get display information for resource usage."""
-        result = []
-
         # Make sure we have resource constraints defined
         if not hasattr(self, "resource_constraints") or not self.resource_constraints:
-            # Check if resourceConstraints is defined in the program
-            resource_constraints = self.program.get("resourceConstraints", [])
-            if resource_constraints:
-                # Convert to the format we need
-                for constraint in resource_constraints:
-                    name = constraint.get("name")
-                    max_concurrent = constraint.get("maxConcurrent", 1)
-                    if name:
-                        current_usage = self.resource_usage.get(name, 0)
-                        result.append(
-                            {
-                                "task_type": name,
-                                "usage": f"{current_usage}/{max_concurrent}",
-                                "percentage": (
-                                    (current_usage / max_concurrent) * 100
-                                    if max_concurrent > 0
-                                    else 0
-                                ),
-                            }
-                        )
-            else:
-                # No resource constraints defined
-                result.append({"task_type": "None", "usage": "0/1", "percentage": 0})
+            # Nothing is constrained, so nothing is ever reserved and these
+            # rows never change; build them once
+            if self._unconstrained_resource_display is None:
+                self._unconstrained_resource_display = (
+                    self._build_unconstrained_resource_display()
+                )
+            rows = self._unconstrained_resource_display
         else:
-            # Use the resource constraints we have
-            for task_type, max_concurrent in self.resource_constraints.items():
-                # Skip null task types
-                if task_type is None:
-                    continue
+            if self._resource_display_version != self._status_version:
+                self._resource_display = self._build_resource_display()
+                self._resource_display_version = self._status_version
+            rows = self._resource_display
 
-                current_usage = self.resource_usage.get(task_type, 0)
-                result.append(
-                    {
-                        "task_type": task_type,
-                        "usage": f"{current_usage}/{max_concurrent}",
-                        "percentage": (
-                            (current_usage / max_concurrent) * 100
-                            if max_concurrent > 0
-                            else 0
-                        ),
-                    }
-                )
+        return [dict(row) for row in rows]
+
+    def _build_resource_display(self) -> List[Dict[str, Any]]:
+        """
+        Build the resource usage display from the active resource constraints.
+
+        Returns:
+            One row per constrained task type with its current usage
+        """
+        result = []
+
+        # Use the resource constraints we have
+        for task_type, max_concurrent in self.resource_constraints.items():
+            # Skip null task types
+            if task_type is None:
+                continue
+
+            current_usage = self.resource_usage.get(task_type, 0)
+            result.append(
+                {
+                    "task_type": task_type,
+                    "usage": f"{current_usage}/{max_concurrent}",
+                    "percentage": (
+                        (current_usage / max_concurrent) * 100
+                        if max_concurrent > 0
+                        else 0
+                    ),
+                }
+            )
+
+        return result
+
+    def _build_unconstrained_resource_display(self) -> List[Dict[str, Any]]:
+        """
+        Build the resource usage display used when no constraints are active.
+
+        Returns:
+            One row per named resource constraint in the program, or a single
+            placeholder row if there are none
+        """
+        result = []
+
+        # Check if resourceConstraints is defined in the program
+        resource_constraints = self.program.get("resourceConstraints", [])
+        if resource_constraints:
+            # Convert to the format we need
+            for constraint in resource_constraints:
+                name = constraint.get("name")
+                max_concurrent = constraint.get("maxConcurrent", 1)
+                if name:
+                    current_usage = self.resource_usage.get(name, 0)
+                    result.append(
+                        {
+                            "task_type": name,
+                            "usage": f"{current_usage}/{max_concurrent}",
+                            "percentage": (
+                                (current_usage / max_concurrent) * 100
+                                if max_concurrent > 0
+                                else 0
+                            ),
+                        }
+                    )
+        else:
+            # No resource constraints defined
+            result.append({"task_type": "None", "usage": "0/1", "percentage": 0})
 
         return result
 
+    def get_header_display(self) -> Dict[str, Any]:
+        """
+        Get the header lines shown above the steps table.
+
+        The lines only change when the program name, running state, time
+        scale, actor usage or sort mode does, so they are formatted then and
+        reused between redraws.
+
+        Returns:
+            Dict with the title, status, actor_usage and sort_mode lines and
+            the actor usage percentage
+        """
+        program_name = self.program.get("name", "Unnamed Program")
+        key = (
+            program_name,
+            self.is_running,
+            self.time_scale,
+            self.actors_available,
+            self.actor_usage,
+            self.sort_mode,
+        )
+        if key != self._header_display_key:
+            actor_percentage = (
+                (self.actor_usage / self.actors_available * 100)
+                if self.actors_available > 0
+                else 0
+            )
+            self._header_display = {
+                "title": f" {program_name} ",
+                "status": f" Status: {'Running' if self.is_running else 'Stopped'} | Time Scale: {self.time_scale}x | Actors: {self.actors_available} ",
+                "actor_usage": f" Actor Usage: {self.actor_usage:.1f}/{self.actors_available} ({actor_percentage:.0f}%) ",
+                "actor_percentage": actor_percentage,
+                "sort_mode": f" Sort: {self.sort_mode.value.capitalize()} ",
+            }
+            self._header_display_key = key
+        return dict(self._header_display)
+
     def get_actor_types_display(self) -> List[Dict[str, Any]]:
         """Get display information for actor types usage."""
+        if self._actor_display_version != self._status_version:
+            self._actor_display = self._build_actor_types_display()
+            self._actor_display_version = self._status_version
+        return [dict(row) for row in self._actor_display]
+
+    def _build_actor_types_display(self) -> List[Dict[str, Any]]:
+        """
+        Build the actor types usage display.
+
+        Returns:
+            One row per actor type with its current usage
+        """
         result = []
 
         for actor_type_id, actor_info in self.actor_types.items():
@@ -1500,10 +2136,10 @@ class ProgramRunner:
 
     def sort_steps(self, steps_info: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Sort steps based on the current sort mode."""
-        if self.sort_mode == SortMode.DEFAULT:
+        if self.sort_mode is SortMode.DEFAULT:
             # Default order (as defined in the program)
             return steps_info
-        elif self.sort_mode == SortMode.REMAINING:
+        elif self.sort_mode is SortMode.REMAINING:
             # Sort by remaining time (running steps with shortest time first, then pending, then completed)
             def remaining_time_key(step_info):
                 if step_info["status"] == "COMPLETED":
@@ -1511,37 +2147,18 @@ class ProgramRunner:
                 elif step_info["status"] == "PENDING":
                     return (1, 0)  # Pending steps in the middle
                 else:
-                    # For running steps, convert remaining time to seconds for sorting
-                    remaining = step_info["remaining"]
-                    if remaining == "N/A":
+                    # For running steps, sort on the numeric remaining time so
+                    # the formatted string never has to be parsed back
+                    remaining = step_info["remaining_seconds"]
+                    if remaining is None:
                         return (0, float("inf"))  # Indefinite duration at the end
-
-                    # Parse the time string (e.g., "1h 30m 15s", "45m 10s", "20s")
-                    seconds = 0
-                    if "h" in remaining:
-                        hours, remaining = remaining.split("h", 1)
-                        seconds += int(hours.strip()) * 3600
-                    if "m" in remaining:
-                        minutes, remaining = remaining.split("m", 1)
-                        seconds += int(minutes.strip()) * 60
-                    if "s" in remaining:
-                        s, _ = remaining.split("s", 1)
-                        seconds += int(s.strip())
-
-                    return (0, seconds)
+                    return (0, remaining)
 
             return sorted(steps_info, key=remaining_time_key)
-        elif self.sort_mode == SortMode.STATUS:
+        elif self.sort_mode is SortMode.STATUS:
             # Sort by status (running first, then pending, then completed)
             def status_key(step_info):
-                if step_info["status"] == "RUNNING":
-                    return 0
-                elif step_info["status"] == "WAITING_FOR_MANUAL":
-                    return 1
-                elif step_info["status"] == "PENDING":
-                    return 2
-                else:  # COMPLETED
-                    return 3
+                return _STATUS_SORT_ORDER.get(step_info["status"], 3)
 
             return sorted(steps_info, key=status_key)
 
@@ -1625,8 +2242,7 @@ class ProgramRunner:
             return
 
         try:
-            # Create step variables for substitution
-            step_vars = StepVariables(step)
+            step_vars = step.step_vars
 
             # Replace variables in the code
             code_with_vars = self._substitute_variables(step.code_block, step_vars)
@@ -1636,13 +2252,11 @@ class ProgramRunner:
                 local_vars = {}
                 # Add step variables to local_vars
                 local_vars["rhyl"] = step_vars
-                exec(code_with_vars, globals(), local_vars)
+                exec(_compile_python_code(code_with_vars), globals(), local_vars)
                 step.code_result = local_vars
             elif step.code_type == "shell":
                 # Execute shell command with variable substitution
-                result = subprocess.run(
-                    code_with_vars, shell=True, capture_output=True, text=True
-                )
+                result = _run_shell_command(code_with_vars)
                 step.code_result = {
                     "stdout": result.stdout,
                     "stderr": result.stderr,
@@ -1664,17 +2278,7 @@ class ProgramRunner:
         Returns:
             The code with variables substituted
         """
-        # Find all {rhyl.variable} patterns
-        pattern = r"\{rhyl\.([a-zA-Z0-9_]+)\}"
-
-        def replace_var(match):
-            var_name = match.group(1)
-            if hasattr(step_vars, var_name):
-                return str(getattr(step_vars, var_name))
-            return match.group(0)  # Return the original if not found
-
-        # Replace all matches
-        return re.sub(pattern, replace_var, code)
+        return _substitute_rhyl_variables(code, step_vars)
 
     def get_progress_bar(self, progress: float) -> str:
         """Generate a progress bar string."""
@@ -1689,17 +2293,8 @@ class ProgramRunner:
 
     def get_status_color(self, status: StepStatus) -> int:
         """Get the color for a step status."""
-        if status == StepStatus.PENDING:
-            return curses.COLOR_WHITE
-        elif status == StepStatus.RUNNING:
-            return curses.COLOR_GREEN
-        elif status == StepStatus.COMPLETED:
-            return curses.COLOR_BLUE
-        elif status == StepStatus.WAITING_FOR_MANUAL:
-            return curses.COLOR_YELLOW
-        elif status == StepStatus.ABORTED:
-            return curses.COLOR_RED
-        return curses.COLOR_WHITE
+        colors = _status_colors()
+        return colors.get(status, colors[_PENDING])
 
     def get_status_display(self, status: Union[StepStatus, str]) -> str:
         """
@@ -1711,32 +2306,11 @@ class ProgramRunner:
         Returns:
             The display string for the status
         """
-        # Convert string status to enum if needed
+        # Unknown status strings are shown as they are
         if isinstance(status, str):
-            try:
-                # Try to match the string to an enum value
-                for enum_status in StepStatus:
-                    if enum_status.value == status:
-                        status = enum_status
-                        break
-                else:
-                    # If no match found, return the string as is
-                    return status
-            except:
-                # If conversion fails, return the string as is
-                return str(status)
-
+            return _STATUS_DISPLAY.get(status, status)
         if isinstance(status, StepStatus):
-            if status == StepStatus.PENDING:
-                return "PENDING"
-            elif status == StepStatus.RUNNING:
-                return "RUNNING"
-            elif status == StepStatus.COMPLETED:
-                return "COMPLETED"
-            elif status == StepStatus.WAITING_FOR_MANUAL:
-                return "WAITING"
-            elif status == StepStatus.ABORTED:
-                return "ABORTED"
+            return _STATUS_DISPLAY[status]
         return "UNKNOWN"  # Default for unhandled status values
 
     def is_step_ready_to_start(self, step: Step, current_time: float) -> bool:
@@ -1751,73 +2325,76 @@ class ProgramRunner:
             True if the step is ready to start, False otherwise
         """
         # Only pending or waiting-for-manual steps can be started
-        if step.status == StepStatus.WAITING_FOR_MANUAL:
+        if step.status is _WAITING_FOR_MANUAL:
             return True  # Already triggered by user, ready to start
-        if step.status != StepStatus.PENDING:
+        if step.status is not _PENDING:
             return False
 
         start_trigger = step.start_trigger
-        trigger_type = start_trigger.get("type")
-
-        # Program start trigger
-        if trigger_type == "programStart":
-            return self.is_running
+        # Manual triggers never get here as PENDING; the step must be set to
+        # WAITING_FOR_MANUAL via trigger_manual_step(). Neither they nor
+        # unknown trigger types have a handler.
+        handler = self._ready_handlers.get(start_trigger.get("type"))
+        if handler is None:
+            return False
+        return handler(step, start_trigger, current_time)
 
-        # Absolute time trigger
-        elif trigger_type == "absolute":
-            trigger_time = datetime.datetime.fromisoformat(
-                start_trigger["time"]
-            ).timestamp()
-            return current_time >= trigger_time
+    def _ready_program_start(
+        self, step: Step, start_trigger: Dict[str, Any], current_time: float
+    ) -> bool:
+        """Check a program start trigger."""
+        return self.is_running
 
-        # Offset time trigger
-        elif trigger_type == "offset":
-            offset_seconds = float(start_trigger["offsetSeconds"])
-            reference_time = self.program_start_time
-            if reference_time is None:
-                return False
-            return current_time >= reference_time + offset_seconds
+    def _ready_absolute(
+        self, step: Step, start_trigger: Dict[str, Any], current_time: float
+    ) -> bool:
+        """Check an absolute time trigger."""
+        return current_time >= _parse_iso_timestamp(start_trigger["time"])
 
-        # Program start with offset trigger
-        elif trigger_type == "programStartOffset":
-            offset_seconds = float(start_trigger["offsetSeconds"])
-            if self.program_start_time is None:
-                return False
-            return current_time >= self.program_start_time + offset_seconds
-
-        # After step trigger
-        elif trigger_type == "afterStep" or trigger_type == "afterStepWithBuffer":
-            ref_step_id = start_trigger["stepId"]
-            # Check if the referenced step is completed
-            if ref_step_id in self.steps:
-                ref_step = self.steps[ref_step_id]
-                if ref_step.status != StepStatus.COMPLETED:
-                    return False
-                # Ensure enough time has passed for predecessor's post-buffer,
-                # this step's pre-buffer, any explicit buffer, and offsetSeconds
-                if ref_step.end_time is not None:
-                    required_delay = (
-                        ref_step.post_buffer_seconds + step.pre_buffer_seconds
-                    )
-                    if trigger_type == "afterStepWithBuffer":
-                        buffer_value = start_trigger.get("bufferSeconds", 0)
-                        required_delay += parse_time_string(buffer_value)
-                    # Handle offsetSeconds on afterStep (same as web visualizer)
-                    offset_value = start_trigger.get("offsetSeconds", 0)
-                    if offset_value:
-                        required_delay += parse_time_string(offset_value)
-                    if required_delay > 0:
-                        return current_time >= ref_step.end_time + required_delay
-                return True
+    def _ready_offset(
+        self, step: Step, start_trigger: Dict[str, Any], current_time: float
+    ) -> bool:
+        """Check an offset time trigger."""
+        offset_seconds = float(start_trigger["offsetSeconds"])
+        reference_time = self.program_start_time
+        if reference_time is None:
             return False
+        return current_time >= reference_time + offset_seconds
 
-        # Manual trigger — step must be set to WAITING_FOR_MANUAL via trigger_manual_step()
-        elif trigger_type == "manual":
+    def _ready_program_start_offset(
+        self, step: Step, start_trigger: Dict[str, Any], current_time: float
+    ) -> bool:
+        """Check a program start with offset trigger."""
+        offset_seconds = float(start_trigger["offsetSeconds"])
+        if self.program_start_time is None:
             return False
+        return current_time >= self.program_start_time + offset_seconds
 
-        # Unknown trigger type
-        else:
-            return False
+    def _ready_after_step(
+        self, step: Step, start_trigger: Dict[str, Any], current_time: float
+    ) -> bool:
+        """Check an after step trigger, with or without a buffer."""
+        ref_step_id = start_trigger["stepId"]
+        # Check if the referenced step is completed
+        if ref_step_id in self.steps:
+            ref_step = self.steps[ref_step_id]
+            if ref_step.status is not _COMPLETED:
+                return False
+            # Ensure enough time has passed for predecessor's post-buffer,
+            # this step's pre-buffer, any explicit buffer, and offsetSeconds
+            if ref_step.end_time is not None:
+                required_delay = ref_step.post_buffer_seconds + step.pre_buffer_seconds
+                if start_trigger.get("type") == "afterStepWithBuffer":
+                    buffer_value = start_trigger.get("bufferSeconds", 0)
+                    required_delay += parse_time_string(buffer_value)
+                # Handle offsetSeconds on afterStep (same as web visualizer)
+                offset_value = start_trigger.get("offsetSeconds", 0)
+                if offset_value:
+                    required_delay += parse_time_string(offset_value)
+                if required_delay > 0:
+                    return current_time >= ref_step.end_time + required_delay
+            return True
+        return False
 
     def emit_event(self, event_type: str, event_data: Dict[str, Any]) -> None:
         """
@@ -1827,15 +2404,16 @@ class ProgramRunner:
             event_type: The type of event
             event_data: The event data
         """
-        # Log the event
-        logging.debug(f"Event: {event_type} - {event_data}")
+        # Log the event; formatting is deferred so the event data is only
+        # rendered when debug logging is enabled
+        logging.debug("Event: %s - %s", event_type, event_data)
 
         # Call any registered event listeners
         for listener in self.event_listeners:
             try:
                 listener(event_type, event_data)
             except Exception as e:
-                logging.error(f"Error in event listener: {e}")
+                logging.error("Error in event listener: %s", e)
 
     def add_event_listener(self, listener):
         """
@@ -1846,6 +2424,24 @@ class ProgramRunner:
         """
         self.event_listeners.append(listener)
 
+    def seconds_until_next_completion(self) -> Optional[float]:
+        """
+        Get the wall clock time until the next running step is due to complete.
+
+        The estimate can be early, if the earliest step has since been
+        aborted, but it is never late.
+
+        Returns:
+            Seconds until the next completion, or None if the program is not
+            running or no running step has an expected end
+        """
+        if not self.is_running or not self._deadlines:
+            return None
+        program_seconds = (
+            self._deadlines[0][0] - _COMPLETION_THRESHOLD - self.current_time
+        )
+        return max(0.0, program_seconds / self.time_scale)
+
     def get_upcoming_events(self, limit: int = 5) -> List[Dict[str, Any]]:
         """
         Get the next upcoming events (step starts or ends).
@@ -1856,54 +2452,94 @@ class ProgramRunner:
         Returns:
             List of upcoming events, each with event_type, step_id, name, time, and time_str
         """
+        current_time = self.current_time
         events = []
+        for event_type, step, event_time in self._upcoming_event_candidates():
+            if len(events) >= limit:
+                break
+            # Estimated starts already in the past are not upcoming
+            if event_type == "start" and event_time < current_time:
+                continue
+            events.append(
+                {
+                    "event_type": event_type,
+                    "step_id": step.step_id,
+                    "name": step.name,
+                    "time": event_time,
+                    "time_str": self.format_time(event_time - current_time),
+                }
+            )
+        return events
+
+    def _upcoming_event_candidates(self) -> List[Tuple[str, Step, float]]:
+        """
+        Get the estimated starts of pending steps and the expected ends of
+        running steps, sorted by time.
+
+        The estimates only change when a step changes status or the program
+        (re)starts, so they are rebuilt then and reused between redraws.
+
+        Returns:
+            List of (event_type, step, time) tuples
+        """
+        key = (self._status_version, self.is_running, self.program_start_time)
+        if key == self._upcoming_events_key:
+            return self._upcoming_events
 
-        # Add potential start events for pending steps
+        candidates = []
+
+        # Add potential start events for pending steps, sharing the estimates
+        # of common predecessors
+        memo: Dict[str, Optional[float]] = {}
         for step in self.steps.values():
-            if step.status == StepStatus.PENDING:
+            if step.status is _PENDING:
                 # Try to estimate when this step will start
-                estimated_start_time = self._estimate_step_start_time(step)
-                if (
-                    estimated_start_time is not None
-                    and estimated_start_time >= self.current_time
-                ):
-                    events.append(
-                        {
-                            "event_type": "start",
-                            "step_id": step.step_id,
-                            "name": step.name,
-                            "time": estimated_start_time,
-                            "time_str": self.format_time(
-                                estimated_start_time - self.current_time
-                            ),
-                        }
-                    )
+                estimated_start_time = self._estimate_step_start_time(step, memo)
+                if estimated_start_time is not None:
+                    candidates.append(("start", step, estimated_start_time))
 
         # Add end events for running steps
         for step in self.steps.values():
-            if step.status == StepStatus.RUNNING and step.expected_end_time is not None:
-                events.append(
-                    {
-                        "event_type": "end",
-                        "step_id": step.step_id,
-                        "name": step.name,
-                        "time": step.expected_end_time,
-                        "time_str": self.format_time(
-                            step.expected_end_time - self.current_time
-                        ),
-                    }
-                )
+            if step.status is _RUNNING and step.expected_end_time is not None:
+                candidates.append(("end", step, step.expected_end_time))
+
+        # Sort by time
+        candidates.sort(key=lambda c: c[2])
+        self._upcoming_events_key = key
+        self._upcoming_events = candidates
+        return candidates
+
+    def _estimate_step_start_time(
+        self, step: Step, memo: Optional[Dict[str, Optional[float]]] = None
+    ) -> Optional[float]:
+        """
+        Estimate when a pending step will start.
 
-        # Sort by time and limit
-        events.sort(key=lambda e: e["time"])
-        return events[:limit]
+        Args:
+            step: The step to estimate
+            memo: Optional estimates by step ID, shared across calls so a
+                chain of afterStep triggers is only resolved once
 
-    def _estimate_step_start_time(self, step: Step) -> Optional[float]:
+        Returns:
+            Estimated start time or None if it can't be determined
         """
-        Estimate when a pending step will start.
+        if memo is None:
+            memo = {}
+        elif step.step_id in memo:
+            return memo[step.step_id]
+        estimate = self._estimate_step_start_time_uncached(step, memo)
+        memo[step.step_id] = estimate
+        return estimate
+
+    def _estimate_step_start_time_uncached(
+        self, step: Step, memo: Dict[str, Optional[float]]
+    ) -> Optional[float]:
+        """
+        Estimate when a pending step will start, without consulting the memo.
 
         Args:
             step: The step to estimate
+            memo: Estimates by step ID for predecessors
 
         Returns:
             Estimated start time or None if it can't be determined
@@ -1912,102 +2548,150 @@ class ProgramRunner:
             return None
 
         trigger = step.start_trigger
-        trigger_type = trigger.get("type")
-
-        if trigger_type == "programStart":
-            return self.program_start_time
+        # Manual and abort triggers can't be estimated, and have no handler
+        handler = self._estimate_handlers.get(trigger.get("type"))
+        if handler is None:
+            return None
+        return handler(step, trigger, memo)
+
+    def _estimate_program_start(
+        self, step: Step, trigger: Dict[str, Any], memo: Dict[str, Optional[float]]
+    ) -> Optional[float]:
+        """Estimate the start of a step with a program start trigger."""
+        return self.program_start_time
+
+    def _estimate_program_start_offset(
+        self, step: Step, trigger: Dict[str, Any], memo: Dict[str, Optional[float]]
+    ) -> Optional[float]:
+        """Estimate the start of a step with a program start offset trigger."""
+        offset_seconds = trigger.get("offsetSeconds", 0)
+        if isinstance(offset_seconds, str):
+            offset_seconds = parse_time_string(offset_seconds)
+        return self.program_start_time + offset_seconds
+
+    def _estimate_after_step(
+        self, step: Step, trigger: Dict[str, Any], memo: Dict[str, Optional[float]]
+    ) -> Optional[float]:
+        """Estimate the start of a step with an after step trigger."""
+        ref_step_id = trigger.get("stepId")
+        if ref_step_id not in self.steps:
+            return None
 
-        elif trigger_type == "programStartOffset":
-            offset_seconds = trigger.get("offsetSeconds", 0)
-            if isinstance(offset_seconds, str):
-                offset_seconds = parse_time_string(offset_seconds)
-            return self.program_start_time + offset_seconds
+        ref_step = self.steps[ref_step_id]
+        event = trigger.get("event", "end")
 
-        elif trigger_type == "afterStep" or trigger_type == "afterStepWithBuffer":
-            ref_step_id = trigger.get("stepId")
-            if ref_step_id not in self.steps:
+        # If reference step is completed, use its actual end time
+        if ref_step.status is _COMPLETED and ref_step.end_time is not None:
+            base_time = ref_step.end_time if event == "end" else ref_step.start_time
+        # If reference step is running and has expected end time
+        elif ref_step.status is _RUNNING and ref_step.expected_end_time is not None:
+            if event == "end":
+                base_time = ref_step.expected_end_time
+            else:
+                base_time = ref_step.start_time
+        # If reference step is still pending, recursively estimate its start/end time
+        elif ref_step.status is _PENDING:
+            ref_start_time = self._estimate_step_start_time(ref_step, memo)
+            if ref_start_time is None:
                 return None
 
-            ref_step = self.steps[ref_step_id]
-            event = trigger.get("event", "end")
-
-            # If reference step is completed, use its actual end time
-            if (
-                ref_step.status == StepStatus.COMPLETED
-                and ref_step.end_time is not None
-            ):
-                base_time = ref_step.end_time if event == "end" else ref_step.start_time
-            # If reference step is running and has expected end time
-            elif (
-                ref_step.status == StepStatus.RUNNING
-                and ref_step.expected_end_time is not None
-            ):
-                if event == "end":
-                    base_time = ref_step.expected_end_time
+            if event == "start":
+                base_time = ref_start_time
+            else:
+                # Estimate end time based on duration
+                if (
+                    ref_step.duration_type is DurationType.FIXED
+                    and ref_step.duration_seconds is not None
+                ):
+                    base_time = ref_start_time + ref_step.duration_seconds
+                elif (
+                    ref_step.duration_type is DurationType.VARIABLE
+                    and ref_step.default_seconds is not None
+                ):
+                    base_time = ref_start_time + ref_step.default_seconds
+                elif (
+                    ref_step.duration_type is DurationType.INDEFINITE
+                    and ref_step.default_seconds is not None
+                ):
+                    base_time = ref_start_time + ref_step.default_seconds
                 else:
-                    base_time = ref_step.start_time
-            # If reference step is still pending, recursively estimate its start/end time
-            elif ref_step.status == StepStatus.PENDING:
-                ref_start_time = self._estimate_step_start_time(ref_step)
-                if ref_start_time is None:
                     return None
+        else:
+            return None
 
-                if event == "start":
-                    base_time = ref_start_time
-                else:
-                    # Estimate end time based on duration
-                    if (
-                        ref_step.duration_type == DurationType.FIXED
-                        and ref_step.duration_seconds is not None
-                    ):
-                        base_time = ref_start_time + ref_step.duration_seconds
-                    elif (
-                        ref_step.duration_type == DurationType.VARIABLE
-                        and ref_step.default_seconds is not None
-                    ):
-                        base_time = ref_start_time + ref_step.default_seconds
-                    elif (
-                        ref_step.duration_type == DurationType.INDEFINITE
-                        and ref_step.default_seconds is not None
-                    ):
-                        base_time = ref_start_time + ref_step.default_seconds
-                    else:
-                        return None
-            else:
-                return None
+        # Add predecessor's post-buffer
+        base_time += ref_step.post_buffer_seconds
 
-            # Add predecessor's post-buffer
-            base_time += ref_step.post_buffer_seconds
+        # Add explicit buffer if afterStepWithBuffer
+        if trigger.get("type") == "afterStepWithBuffer":
+            buffer_seconds = trigger.get("bufferSeconds", 0)
+            if isinstance(buffer_seconds, str):
+                buffer_seconds = parse_time_string(buffer_seconds)
+            base_time += buffer_seconds
 
-            # Add explicit buffer if afterStepWithBuffer
-            if trigger_type == "afterStepWithBuffer":
-                buffer_seconds = trigger.get("bufferSeconds", 0)
-                if isinstance(buffer_seconds, str):
-                    buffer_seconds = parse_time_string(buffer_seconds)
-                base_time += buffer_seconds
+        # Handle offsetSeconds on afterStep (same as web visualizer)
+        offset_seconds = trigger.get("offsetSeconds", 0)
+        if offset_seconds:
+            if isinstance(offset_seconds, str):
+                offset_seconds = parse_time_string(offset_seconds)
+            base_time += offset_seconds
 
-            # Handle offsetSeconds on afterStep (same as web visualizer)
-            offset_seconds = trigger.get("offsetSeconds", 0)
-            if offset_seconds:
-                if isinstance(offset_seconds, str):
-                    offset_seconds = parse_time_string(offset_seconds)
-                base_time += offset_seconds
+        # Add this step's pre-buffer
+        base_time += step.pre_buffer_seconds
 
-            # Add this step's pre-buffer
-            base_time += step.pre_buffer_seconds
+        return base_time
 
-            return base_time
 
-        elif trigger_type == "manual" or trigger_type == "onAbort":
-            # Can't estimate manual triggers or abort triggers
-            return None
+# Step progress bars indexed by the number of filled cells (0-10), with a
+# marker at the head until the bar is full
+_PROGRESS_BARS = tuple(
+    (
+        "[" + "#" * filled + ">" + " " * (9 - filled) + "]"
+        if filled < 10
+        else "[" + "#" * 10 + "]"
+    )
+    for filled in range(11)
+)
 
-        return None
+# Steps table row, padding each column to the start of the next one (Step ID
+# at 2, Name at 20, Track at 40, Status at 55, Progress at 65, Remaining at 80)
+_STEP_ROW_FORMAT = "{:<18}{:<20}{:<15}{:<10}{:<15}{}"
+
+# Resource and actor usage bars indexed by the number of filled cells
+_USAGE_BAR_WIDTH = 20
+_USAGE_BARS = tuple(
+    "[" + "#" * filled + " " * (_USAGE_BAR_WIDTH - filled) + "]"
+    for filled in range(_USAGE_BAR_WIDTH + 1)
+)
+
+
+def _usage_bar(percentage: float) -> str:
+    """
+    Get the usage bar for a usage percentage.
+
+    Args:
+        percentage: The usage percentage
+
+    Returns:
+        The usage bar, wider than usual if the usage is over capacity
+    """
+    filled = int((percentage / 100) * _USAGE_BAR_WIDTH)
+    if 0 <= filled <= _USAGE_BAR_WIDTH:
+        return _USAGE_BARS[filled]
+    return "[" + "#" * filled + " " * (_USAGE_BAR_WIDTH - filled) + "]"
 
 
 def draw_ui(stdscr, runner: ProgramRunner) -> None:
-    """Draw the user interface."""
-    stdscr.clear()
+    """
+    Draw the user interface.
+
+    The screen is erased rather than cleared, so the refresh only sends the
+    cells that changed since the last frame instead of repainting the whole
+    terminal.
+    """
+    import curses
+
+    stdscr.erase()
     height, width = stdscr.getmaxyx()
 
     # Initialize colors
@@ -2035,31 +2719,31 @@ def draw_ui(stdscr, runner: ProgramRunner) -> None:
             # Catch any curses errors (like writing to the bottom-right corner)
             pass
 
+    header_display = runner.get_header_display()
+
     # Draw header
-    program_name = runner.program.get("name", "Unnamed Program")
-    header = f" {program_name} "
+    header = header_display["title"]
     safe_addstr(0, (width - len(header)) // 2, header, curses.A_BOLD)
 
     # Draw status
-    status = f" Status: {'Running' if runner.is_running else 'Stopped'} | Time Scale: {runner.time_scale}x | Actors: {runner.actors_available} "
+    status = header_display["status"]
     safe_addstr(1, (width - len(status)) // 2, status)
 
     # Draw actor usage
-    actor_percentage = (
-        (runner.actor_usage / runner.actors_available * 100)
-        if runner.actors_available > 0
-        else 0
-    )
-    actor_str = f" Actor Usage: {runner.actor_usage:.1f}/{runner.actors_available} ({actor_percentage:.0f}%) "
+    actor_str = header_display["actor_usage"]
     safe_addstr(
         2,
         (width - len(actor_str)) // 2,
         actor_str,
-        curses.color_pair(1) if actor_percentage > 80 else curses.A_NORMAL,
+        (
+            curses.color_pair(1)
+            if header_display["actor_percentage"] > 80
+            else curses.A_NORMAL
+        ),
     )
 
     # Draw sort mode
-    sort_mode_text = f" Sort: {runner.sort_mode.value.capitalize()} "
+    sort_mode_text = header_display["sort_mode"]
     safe_addstr(1, max(0, width - len(sort_mode_text) - 2), sort_mode_text)
 
     # Draw time
@@ -2078,7 +2762,7 @@ def draw_ui(stdscr, runner: ProgramRunner) -> None:
     safe_addstr(header_y, 40, "Track", curses.A_BOLD)
 
     # Add sort indicator to the status header if sorting by status
-    if runner.sort_mode == SortMode.STATUS:
+    if runner.sort_mode is SortMode.STATUS:
         safe_addstr(header_y, 55, "Status ↑", curses.A_BOLD)
     else:
         safe_addstr(header_y, 55, "Status", curses.A_BOLD)
@@ -2086,67 +2770,55 @@ def draw_ui(stdscr, runner: ProgramRunner) -> None:
     safe_addstr(header_y, 65, "Progress", curses.A_BOLD)
 
     # Add sort indicator to the remaining header if sorting by remaining time
-    if runner.sort_mode == SortMode.REMAINING:
+    if runner.sort_mode is SortMode.REMAINING:
         safe_addstr(header_y, 80, "Remaining ↑", curses.A_BOLD)
     else:
         safe_addstr(header_y, 80, "Remaining", curses.A_BOLD)
 
-    # Table rows
+    # Table rows, with the names used for every row bound to locals
+    a_bold = curses.A_BOLD
+    a_normal = curses.A_NORMAL
+    get_status_display = runner.get_status_display
+    format_row = _STEP_ROW_FORMAT.format
+    progress_bars = _PROGRESS_BARS
+    # Leave space for resources, upcoming events, and triggers
+    rows_end_y = height - 13
     last_row_y = header_y  # Track the last row we drew
-    for i, step_info in enumerate(steps_info):
-        row_y = header_y + 1 + i
-        if (
-            row_y >= height - 13
-        ):  # Leave space for resources, upcoming events, and triggers
+    for row_y, step_info in enumerate(steps_info, header_y + 1):
+        if row_y >= rows_end_y:
             break
         last_row_y = row_y
 
-        # Get status color
-        status_color = 0
-        if step_info["status"] == "RUNNING":
-            status_color = 1
-        elif step_info["status"] == "COMPLETED":
-            status_color = 2
-        elif step_info["status"] == "WAITING_FOR_MANUAL":
-            status_color = 3
-        elif step_info["status"] == "ABORTED":
-            status_color = 4
-
         # Get status display
-        status_display = runner.get_status_display(step_info["status"])
+        status = step_info["status"]
+        status_display = get_status_display(status)
 
         # Highlight running steps
-        attr = curses.A_NORMAL
-        if step_info["status"] == "RUNNING":
-            attr = curses.A_BOLD
+        is_running = status == "RUNNING"
+        attr = a_bold if is_running else a_normal
 
         # Draw selection indicator
         if step_info.get("selected", False):
-            safe_addstr(row_y, 0, ">", curses.A_BOLD)
-
-        safe_addstr(row_y, 2, step_info["id"][:15], attr)
-        safe_addstr(row_y, 20, step_info["name"][:18], attr)
-        safe_addstr(row_y, 40, step_info["track"][:13], attr)
-        safe_addstr(row_y, 55, status_display[:8], attr)
-
-        # Draw progress bar for running steps
-        if step_info["status"] == "RUNNING" and step_info["progress"] >= 0:
-            progress_width = 10
-            filled = int((step_info["progress"] / 100) * progress_width)
-            # Show at least 1 symbol if progress > 0 but < 10%
-            if step_info["progress"] > 0 and filled == 0:
-                progress_bar = "[>" + " " * (progress_width - 1) + "]"
-            elif filled == progress_width:
-                progress_bar = "[" + "#" * filled + "]"
-            else:
-                progress_bar = (
-                    "[" + "#" * filled + ">" + " " * (progress_width - filled - 1) + "]"
-                )
-            safe_addstr(row_y, 65, progress_bar, attr)
-        else:
-            safe_addstr(row_y, 65, "N/A", attr)
+            safe_addstr(row_y, 0, ">", a_bold)
 
-        safe_addstr(row_y, 80, step_info["remaining"], attr)
+        # Progress bar for running steps
+        if is_running and step_info["progress"] >= 0:
+            # Progress is capped at 100%, so this indexes one of 11 bars
+            filled = int((step_info["progress"] / 100) * 10)
+            progress_bar = progress_bars[filled]
+        else:
+            progress_bar = "N/A"
+
+        # Draw the whole row at once, the columns all share the row attribute
+        row = format_row(
+            step_info["id"][:15],
+            step_info["name"][:18],
+            step_info["track"][:13],
+            status_display[:8],
+            progress_bar,
+            step_info["remaining"],
+        )
+        safe_addstr(row_y, 2, row, attr)
 
     # Draw resource usage (left column in bottom section)
     resource_y = height - 12  # Move up to make room for actor types
@@ -2161,10 +2833,7 @@ def draw_ui(stdscr, runner: ProgramRunner) -> None:
         safe_addstr(row_y, 4, f"{resource['task_type']}: {resource['usage']}")
 
         # Draw usage bar
-        bar_width = 20
-        filled = int((resource["percentage"] / 100) * bar_width)
-        bar = "[" + "#" * filled + " " * (bar_width - filled) + "]"
-        safe_addstr(row_y, 25, bar)
+        safe_addstr(row_y, 25, _usage_bar(resource["percentage"]))
 
     # Draw actor types usage
     actor_types_y = height - 8
@@ -2179,13 +2848,10 @@ def draw_ui(stdscr, runner: ProgramRunner) -> None:
         safe_addstr(row_y, 4, f"{actor_type['actor_type']}: {actor_type['usage']}")
 
         # Draw usage bar
-        bar_width = 20
-        filled = int((actor_type["percentage"] / 100) * bar_width)
-        bar = "[" + "#" * filled + " " * (bar_width - filled) + "]"
         color_attr = (
             curses.color_pair(1) if actor_type["percentage"] > 80 else curses.A_NORMAL
         )
-        safe_addstr(row_y, 25, bar, color_attr)
+        safe_addstr(row_y, 25, _usage_bar(actor_type["percentage"]), color_attr)
 
     # Draw upcoming events (right column in bottom section)
     events_col_x = 55  # Start column for events (right of resource usage)
@@ -2266,17 +2932,30 @@ def draw_ui(stdscr, runner: ProgramRunner) -> None:
     stdscr.refresh()
 
 
-def handle_input(stdscr, runner: ProgramRunner) -> bool:
-    """Handle user input."""
-    try:
-        key = stdscr.getkey()
-    except:
-        return True
+def handle_input(stdscr, runner: ProgramRunner, key: Optional[str] = None) -> bool:
+    """
+    Handle user input.
+
+    Args:
+        stdscr: The curses screen
+        runner: The program runner
+        key: A key already read from the screen, read here if not given
+
+    Returns:
+        False if the user asked to quit, True otherwise
+    """
+    import curses
+
+    if key is None:
+        try:
+            key = stdscr.getkey()
+        except:
+            return True
 
     if key == "q":
         return False
     elif key == "s" and not runner.is_running:
-        runner.command_queue.put("start_program")
+        runner.command_queue.put(("start_program",))
     elif key == "KEY_UP" or key == "k":
         # Select previous step
         runner.select_previous_step()
@@ -2307,22 +2986,19 @@ def handle_input(stdscr, runner: ProgramRunner) -> bool:
             return True
 
         # Check if the step can be triggered to START
-        if (
-            selected_step.status == StepStatus.PENDING
-            and selected_step.has_manual_trigger()
-        ):
+        if selected_step.status is _PENDING and selected_step.has_manual_trigger():
             # Use the start trigger name if available, otherwise fall back to duration trigger
             start_name = (
                 getattr(selected_step, "manual_start_trigger_name", None)
                 or selected_step.manual_trigger_name
             )
-            runner.command_queue.put(f"trigger:{start_name}:{selected_step_id}")
-        elif selected_step.status == StepStatus.RUNNING and (
-            selected_step.duration_type == "variable"
-            or selected_step.duration_type == "indefinite"
+            runner.command_queue.put(("trigger", start_name, selected_step_id))
+        elif selected_step.status is _RUNNING and (
+            selected_step.duration_type is DurationType.VARIABLE
+            or selected_step.duration_type is DurationType.INDEFINITE
         ):
             # Check if we've reached minimum duration for variable steps
-            if selected_step.duration_type == "variable":
+            if selected_step.duration_type is DurationType.VARIABLE:
                 progress = selected_step.get_progress(runner.current_time)
                 min_progress = (
                     selected_step.min_seconds / selected_step.default_seconds
@@ -2333,7 +3009,7 @@ def handle_input(stdscr, runner: ProgramRunner) -> bool:
 
             # Trigger the step to COMPLETE (use duration trigger name)
             runner.command_queue.put(
-                f"trigger:{selected_step.manual_trigger_name}:{selected_step_id}"
+                ("trigger", selected_step.manual_trigger_name, selected_step_id)
             )
         else:
             runner.status_message = (
@@ -2351,7 +3027,7 @@ def handle_input(stdscr, runner: ProgramRunner) -> bool:
 
         # Check if the step can be aborted
         if selected_step.can_be_aborted():
-            runner.command_queue.put(f"abort:{selected_step_id}")
+            runner.command_queue.put(("abort", selected_step_id))
             runner.status_message = f"Aborting step '{selected_step.name}'..."
         else:
             runner.status_message = (
@@ -2367,7 +3043,7 @@ def handle_input(stdscr, runner: ProgramRunner) -> bool:
 
         selected_step = runner.steps[selected_step_id]
 
-        if selected_step.status == StepStatus.RUNNING:
+        if selected_step.status is _RUNNING:
             runner.complete_step(selected_step, runner.current_time)
             runner.status_message = f"Force completed step '{selected_step.name}'"
         else:
@@ -2419,14 +3095,19 @@ def handle_input(stdscr, runner: ProgramRunner) -> bool:
                         idx = int(selection) - 1
                         if 0 <= idx < len(available_triggers):
                             trigger = available_triggers[idx]
-                            if trigger["id"] == "start_program":
-                                runner.command_queue.put("start_program")
+                            # Build the command from the trigger's fields, the
+                            # ID is never parsed since names may contain ':'
+                            if trigger["type"] == "program":
+                                runner.command_queue.put(("start_program",))
+                            elif trigger["type"] == "abort":
+                                runner.command_queue.put(("abort", trigger["step_id"]))
                             else:
-                                trigger_type, trigger_name, step_id = trigger[
-                                    "id"
-                                ].split(":", 2)
                                 runner.command_queue.put(
-                                    f"trigger:{trigger_name}:{step_id}"
+                                    (
+                                        "trigger",
+                                        trigger["trigger_name"],
+                                        trigger["step_id"],
+                                    )
                                 )
                     break
                 elif ch.isdigit():
@@ -2440,12 +3121,16 @@ def handle_input(stdscr, runner: ProgramRunner) -> bool:
         runner.time_scale = min(100.0, runner.time_scale * 2)
     elif key == "-" or key == "_":
         runner.time_scale = max(0.1, runner.time_scale / 2)
+    elif key == "KEY_RESIZE" or key == "\x0c":
+        # Repaint the whole terminal on the next refresh, after a resize or
+        # Ctrl-L
+        stdscr.clear()
     elif key == "o" or key == "O":
         # Toggle sort mode
-        if runner.sort_mode == SortMode.DEFAULT:
+        if runner.sort_mode is SortMode.DEFAULT:
             runner.sort_mode = SortMode.REMAINING
             runner.status_message = "Sorted by remaining time"
-        elif runner.sort_mode == SortMode.REMAINING:
+        elif runner.sort_mode is SortMode.REMAINING:
             runner.sort_mode = SortMode.STATUS
             runner.status_message = "Sorted by status"
         else:
@@ -2455,29 +3140,92 @@ def handle_input(stdscr, runner: ProgramRunner) -> bool:
     return True
 
 
+# Keys that only move the selection, change the time scale or toggle the sort
+# order. Runs of these are handled together before the next redraw.
+_BATCHED_KEYS = frozenset(
+    {"KEY_UP", "k", "KEY_DOWN", "j", "+", "=", "-", "_", "o", "O"}
+)
+
+
+def _read_key_batch(stdscr, key: str) -> List[str]:
+    """
+    Read the keys already waiting after a key, so a held key is handled
+    without a redraw for every repeat.
+
+    Reading stops after the first key that acts on a step, quits or opens
+    the trigger menu, leaving later keys to the next iteration (or the menu).
+
+    Args:
+        stdscr: The curses screen
+        key: The key already read
+
+    Returns:
+        The keys to handle, in the order they were typed
+    """
+    import curses
+
+    keys = [key]
+    stdscr.nodelay(True)
+    try:
+        while key in _BATCHED_KEYS:
+            try:
+                key = stdscr.getkey()
+            except curses.error:
+                break  # No more keys waiting
+            keys.append(key)
+    finally:
+        stdscr.nodelay(False)
+    return keys
+
+
 def main_loop(stdscr, runner: ProgramRunner) -> None:
-    """Main loop for the program runner."""
+    """
+    Main loop for the program runner.
+
+    The loop waits for input instead of sleeping. While the program runs the
+    screen is redrawn every frame, and the wait is cut short when a step is
+    due to complete. Otherwise it is only redrawn after input or a change of
+    status, so an idle runner does not repaint.
+    """
+    import curses
+
     # Set up curses
     curses.curs_set(0)  # Hide cursor
-    stdscr.timeout(100)  # Set non-blocking input timeout
 
     # Start the program
     runner.start()
 
     # Main loop
+    drawn_state = None
     running = True
     while running:
         # Update program state
         runner.update()
 
-        # Draw UI
-        draw_ui(stdscr, runner)
-
-        # Handle input
-        running = handle_input(stdscr, runner)
-
-        # Sleep to limit CPU usage
-        time.sleep(0.05)
+        # Draw UI, progress and times only advance while the program runs
+        state = (runner.is_running, runner._status_version, runner.status_message)
+        if runner.is_running or state != drawn_state:
+            draw_ui(stdscr, runner)
+            drawn_state = state
+
+        # Wait for input until the next frame or the next step completion
+        timeout = _FRAME_INTERVAL
+        until_completion = runner.seconds_until_next_completion()
+        if until_completion is not None:
+            timeout = min(timeout, until_completion)
+        stdscr.timeout(max(1, int(timeout * 1000)))
+        try:
+            key = stdscr.getkey()
+        except:
+            continue  # No input before the timeout
+
+        # Handle input, including keys typed since, which can change anything
+        # on screen
+        for key in _read_key_batch(stdscr, key):
+            running = handle_input(stdscr, runner, key)
+            if not running:
+                break
+        drawn_state = None
 
 
 def run_program(
@@ -2569,6 +3317,8 @@ def run_program(
     runner = ProgramRunner(program, time_scale=time_scale, auto_start=auto_start)
 
     # Run the program with curses UI
+    import curses
+
     try:
         curses.wrapper(lambda stdscr: main_loop(stdscr, runner))
     except KeyboardInterrupt:
@@ -7,14 +7,21 @@ It ensures that programs conform to the specification for real-time schedules.
 """
 
 import argparse
+import copy
 import json
 import os
 import sys
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 from jsonschema import SchemaError, ValidationError, validate
 
+try:
+    # Use the libyaml-backed loader when PyYAML was built with it
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Import environment loader for environment-based validation
 try:
     from .environment_loader import get_default_loader, load_resource_constraints
@@ -32,15 +39,27 @@ except ImportError:
         return None  # type: ignore
 
 
+# Parsed YAML files keyed by (absolute path, mtime, size), so unchanged files
+# are not parsed again
+_YAML_FILE_CACHE: Dict[Tuple[str, int, int], Any] = {}
+
+
 def load_program_file(file_path: str) -> Dict[str, Any]:
     """Load and parse a program file (JSON or YAML)."""
     try:
-        with open(file_path, "r") as file:
-            # Determine file type based on extension
-            _, ext = os.path.splitext(file_path)
-            if ext.lower() in [".yaml", ".yml"]:
-                return yaml.safe_load(file)
-            else:  # Default to JSON
+        # Determine file type based on extension
+        _, ext = os.path.splitext(file_path)
+        if ext.lower() in [".yaml", ".yml"]:
+            st = os.stat(file_path)
+            key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+            if key not in _YAML_FILE_CACHE:
+                # Hand libyaml the whole file as one buffer
+                with open(file_path, "rb") as file:
+                    _YAML_FILE_CACHE[key] = yaml.load(file.read(), Loader=_YamlLoader)
+            # Callers modify the returned program, hand out a private copy
+            return copy.deepcopy(_YAML_FILE_CACHE[key])
+        else:  # Default to JSON
+            with open(file_path, "r") as file:
                 return json.load(file)
     except (json.JSONDecodeError, yaml.YAMLError) as e:
         print(f"Error parsing file {file_path}: {e}")
@@ -355,6 +374,8 @@ def validate_track_step_overlaps(program: Dict[str, Any]) -> List[str]:
         List of error messages for any overlapping steps found
     """
     errors = []
+    # Start times shared by all tracks, a step's start time is calculated once
+    start_times: Dict[Tuple[int, int], int] = {}
 
     # Calculate step timing for each track
     for track_idx, track in enumerate(program.get("tracks", [])):
@@ -373,7 +394,7 @@ def validate_track_step_overlaps(program: Dict[str, Any]) -> List[str]:
             duration = parse_duration_to_seconds(step.get("duration", "0s"))
 
             # Calculate start time based on trigger
-            start_time = calculate_step_start_time(step, steps, program)
+            start_time = calculate_step_start_time(step, steps, program, start_times)
             end_time = start_time + duration
 
             step_timings.append(
@@ -444,7 +465,10 @@ def parse_duration_to_seconds(duration: Any) -> int:
 
 
 def calculate_step_start_time(
-    step: Dict[str, Any], track_steps: List[Dict[str, Any]], program: Dict[str, Any]
+    step: Dict[str, Any],
+    track_steps: List[Dict[str, Any]],
+    program: Dict[str, Any],
+    start_times: Optional[Dict[Tuple[int, int], int]] = None,
 ) -> int:
     """
     Calculate the start time of a step based on its trigger.
@@ -453,10 +477,30 @@ def calculate_step_start_time(
         step: The step to calculate start time for
         track_steps: All steps in the same track
         program: The full program (for cross-track dependencies)
+        start_times: Start times already calculated for this program, filled
+            in by this call. Pass the same dict for all steps of a program so
+            each step is calculated once.
 
     Returns:
         Start time in seconds from program start
     """
+    if start_times is None:
+        start_times = {}
+    key = (id(step), id(track_steps))
+    start_time = start_times.get(key)
+    if start_time is None:
+        start_time = _calculate_step_start_time(step, track_steps, program, start_times)
+        start_times[key] = start_time
+    return start_time
+
+
+def _calculate_step_start_time(
+    step: Dict[str, Any],
+    track_steps: List[Dict[str, Any]],
+    program: Dict[str, Any],
+    start_times: Dict[Tuple[int, int], int],
+) -> int:
+    """Calculate the start time of a step, see calculate_step_start_time."""
     start_trigger = step.get("startTrigger", {})
     trigger_type = start_trigger.get("type", "programStart")
 
@@ -499,7 +543,7 @@ def calculate_step_start_time(
 
         # Calculate referenced step's timing
         referenced_start_time = calculate_step_start_time(
-            referenced_step, referenced_track_steps, program
+            referenced_step, referenced_track_steps, program, start_times
         )
         referenced_duration = parse_duration_to_seconds(
             referenced_step.get("duration", "0s")
@@ -525,7 +569,7 @@ def calculate_step_start_time(
         for s in track_steps:
             if s.get("stepId") == step_id:
                 break
-            s_start = calculate_step_start_time(s, track_steps, program)
+            s_start = calculate_step_start_time(s, track_steps, program, start_times)
             s_duration = parse_duration_to_seconds(s.get("duration", "0s"))
             prev_end_time = s_start + s_duration
         return max(0, prev_end_time + offset_seconds)
@@ -0,0 +1,225 @@
+"""
+Unit tests for the ProgramPlanner class.
+
+This module tests schedule optimization.
+"""
+
+import json
+import logging
+import os
+import subprocess
+import sys
+
+import pytest
+
+from rhylthyme_cli_runner.program_planner import (
+    ProgramPlanner,
+    load_program_file,
+    plan_program,
+    save_optimized_program,
+)
+
+
+def _make_step(step_id, resource, duration, after=None, priority=100):
+    """Create a fixed-duration step using a single resource."""
+    if after:
+        start_trigger = {"type": "afterStep", "stepId": after}
+    else:
+        start_trigger = {"type": "programStart"}
+    return {
+        "id": step_id,
+        "name": step_id,
+        "duration": duration,
+        "resources": [resource],
+        "priority": priority,
+        "startTrigger": start_trigger,
+    }
+
+
+def _oven_program(first_start, second_start):
+    """Create two tracks each using the oven for 10 seconds."""
+    tracks = []
+    for index, start in enumerate((first_start, second_start)):
+        track_id = f"track{index}"
+        tracks.append(
+            {
+                "id": track_id,
+                "name": track_id,
+                "startTime": start,
+                "steps": [_make_step(f"{track_id}_a", "oven", 10)],
+            }
+        )
+    return {"programId": "ovens", "name": "Oven Program", "tracks": tracks}
+
+
+def _assert_no_collisions(program):
+    """Check that no two tracks of a program use a resource at the same time."""
+    planner = ProgramPlanner(program)
+    start_times = planner.simulate_execution()
+    # Simulated times start every track at the first track's startTime
+    simulation_start = program["tracks"][0].get("startTime", 0)
+
+    usage = {}
+    for track in program["tracks"]:
+        offset = track.get("startTime", 0) - simulation_start
+        for step in track["steps"]:
+            start = start_times[track["id"]][step["id"]] + offset
+            end = start + planner.steps[track["id"]][step["id"]].calculate_duration()
+            for resource in step["resources"]:
+                usage.setdefault(resource, []).append((start, end, track["id"]))
+
+    for resource, intervals in usage.items():
+        for start, end, track_id in intervals:
+            for other_start, other_end, other_track_id in intervals:
+                if other_track_id != track_id:
+                    assert end <= other_start or other_end <= start, resource
+
+
+@pytest.fixture
+def contended_program():
+    """Three tracks of two steps each sharing two resources."""
+    track_specs = [
+        ("oven", 11, "oven", 8, 1),
+        ("oven", 15, "mixer", 19, 2),
+        ("mixer", 2, "mixer", 19, 3),
+    ]
+    tracks = []
+    for index, (first, first_duration, second, second_duration, priority) in enumerate(
+        track_specs
+    ):
+        track_id = f"track{index}"
+        tracks.append(
+            {
+                "id": track_id,
+                "name": track_id,
+                "steps": [
+                    _make_step(f"{track_id}_a", first, first_duration, None, priority),
+                    _make_step(
+                        f"{track_id}_b",
+                        second,
+                        second_duration,
+                        f"{track_id}_a",
+                        priority,
+                    ),
+                ],
+            }
+        )
+    return {"programId": "contended", "name": "Contended Program", "tracks": tracks}
+
+
+@pytest.mark.unit
+class TestProgramPlanner:
+    """Test ProgramPlanner functionality."""
+
+    def test_staggered_tracks_do_not_collide(self, contended_program):
+        """Test that staggered tracks never share a resource at the same time."""
+        optimized = ProgramPlanner(contended_program).optimize_schedule()
+
+        # The padding steps added by optimization are part of the schedule
+        assert any(
+            step["id"].startswith("padding_")
+            for track in optimized["tracks"]
+            for step in track["steps"]
+        )
+        _assert_no_collisions(optimized)
+
+    def test_stagger_keeps_start_times_of_tracks_that_do_not_collide(self):
+        """Test that tracks already apart keep the startTime they were given."""
+        for first_start, second_start in ((0, 100), (50, 0)):
+            program = _oven_program(first_start, second_start)
+            optimized = ProgramPlanner(program).optimize_schedule()
+
+            assert [track.get("startTime", 0) for track in optimized["tracks"]] == [
+                first_start,
+                second_start,
+            ]
+
+    def test_stagger_delays_colliding_track_from_its_own_start_time(self):
+        """Test that a colliding track is moved just past the other track."""
+        optimized = ProgramPlanner(_oven_program(50, 55)).optimize_schedule()
+
+        assert [track["startTime"] for track in optimized["tracks"]] == [50, 60]
+        _assert_no_collisions(optimized)
+
+    def test_optimization_is_independent_of_hash_seed(
+        self, contended_program, temp_dir
+    ):
+        """Test that planning gives the same output under any PYTHONHASHSEED."""
+        input_file = os.path.join(temp_dir, "program.json")
+        with open(input_file, "w") as f:
+            json.dump(contended_program, f)
+
+        src_path = os.path.join(os.path.dirname(__file__), "..", "src")
+        outputs = set()
+        for seed in ("0", "1", "2", "3", "4", "5"):
+            output_file = os.path.join(temp_dir, f"optimized_{seed}.json")
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    "import sys; from rhylthyme_cli_runner.program_planner "
+                    "import plan_program; "
+                    "sys.exit(not plan_program(sys.argv[1], sys.argv[2]))",
+                    input_file,
+                    output_file,
+                ],
+                check=True,
+                env={**os.environ, "PYTHONHASHSEED": seed, "PYTHONPATH": src_path},
+            )
+            with open(output_file, "rb") as f:
+                outputs.add(f.read())
+
+        assert len(outputs) == 1
+
+    @pytest.mark.parametrize(
+        "program",
+        [
+            {"name": "Crème brûlée", "duration": 5, "tags": []},
+            {"name": "Proof", "duration": float("inf"), "delay": float("nan")},
+            {"name": "Nothing", "description": None},
+        ],
+    )
+    def test_saved_json_matches_json_dumps(self, program, temp_dir):
+        """Test that saved JSON is the same whether or not orjson is installed."""
+        output_file = os.path.join(temp_dir, "optimized.json")
+        save_optimized_program(program, output_file)
+
+        with open(output_file, "rb") as f:
+            assert f.read() == json.dumps(program, indent=2).encode("utf-8")
+
+    @pytest.mark.parametrize(
+        "document",
+        [
+            '{"duration": NaN, "maxSeconds": Infinity}',
+            '{"id": 123456789012345678901234567890}',
+            '{"name": "Cr\\u00e8me", "duration": 1.5}',
+        ],
+    )
+    def test_load_program_file_matches_json_load(self, document, temp_dir):
+        """Test that loading accepts the same JSON as json.load."""
+        input_file = os.path.join(temp_dir, "program.json")
+        with open(input_file, "w") as f:
+            f.write(document)
+
+        loaded = load_program_file(input_file)
+        expected = json.loads(document)
+        assert json.dumps(loaded) == json.dumps(expected)
+        assert type(loaded.popitem()[1]) is type(expected.popitem()[1])
+
+    def test_verbose_errors_go_to_stderr_once(
+        self, contended_program, temp_dir, capsys, caplog
+    ):
+        """Test that verbose tracebacks go to stderr and skip root handlers."""
+        input_file = os.path.join(temp_dir, "program.json")
+        with open(input_file, "w") as f:
+            json.dump(contended_program, f)
+        output_file = os.path.join(temp_dir, "missing", "optimized.json")
+
+        with caplog.at_level(logging.INFO):
+            assert not plan_program(input_file, output_file, verbose=True)
+
+        captured = capsys.readouterr()
+        assert "Resource bottlenecks found:" in captured.out
+        assert "Traceback" not in captured.out
+        assert "Traceback" in captured.err
+        assert not caplog.records
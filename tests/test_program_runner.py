@@ -54,6 +54,16 @@ class TestProgramRunner:
         assert "step1" in step_ids
         assert "step2" in step_ids
 
+    def test_get_all_steps_display_info_returns_copies(self, simple_program):
+        """Test that changing returned display info doesn't change later calls."""
+        runner = ProgramRunner(simple_program)
+
+        steps_info = runner.get_all_steps_display_info()
+        original_name = steps_info[0]["name"]
+        steps_info[0]["name"] = "MUTATED"
+
+        assert runner.get_all_steps_display_info()[0]["name"] == original_name
+
     def test_program_start_trigger(self, simple_program):
         """Test program start trigger handling."""
         # Modify to have manual start trigger
@@ -223,6 +233,87 @@ class TestProgramRunnerBuffers:
             pass
 
 
+@pytest.mark.unit
+class TestProgramRunnerStepLifecycle:
+    """Test completing and aborting running steps."""
+
+    @pytest.fixture
+    def shared_actor_program(self):
+        """Two tracks whose steps need the same actor type at the same time."""
+
+        def make_step(step_id, seconds):
+            return {
+                "stepId": step_id,
+                "name": step_id,
+                "startTrigger": {"type": "programStart"},
+                "duration": {"type": "fixed", "seconds": seconds},
+                "task": "prep",
+            }
+
+        return {
+            "programId": "shared-actor-test",
+            "name": "Shared Actor Test Program",
+            "version": "1.0.0",
+            "environmentType": "test",
+            "startTrigger": {"type": "manual"},
+            "tracks": [
+                {"trackId": "first", "name": "First", "steps": [make_step("a", 10)]},
+                {"trackId": "second", "name": "Second", "steps": [make_step("b", 20)]},
+            ],
+            "resourceConstraints": [{"task": "prep", "maxConcurrent": 2}],
+            "actors": 2,
+        }
+
+    def _start_all(self, runner):
+        runner.program_start_time = 0.0
+        runner.is_running = True
+        runner.start_ready_steps(0.0)
+        assert all(step.status == StepStatus.RUNNING for step in runner.steps.values())
+
+    def test_abort_releases_only_its_actors(self, shared_actor_program):
+        """Test that aborting a step leaves the other step's actors reserved."""
+        runner = ProgramRunner(shared_actor_program)
+        self._start_all(runner)
+        assert runner.actor_usage_by_type["generic"] == 2.0
+
+        runner.abort_step(runner.get_step_by_id("a"), 1.0)
+
+        assert runner.actor_usage_by_type["generic"] == 1.0
+        assert runner.actor_usage == 1.0
+        assert runner.resource_usage["prep"] == 1.0
+
+        # Aborting again must not release anything twice
+        runner.abort_step(runner.get_step_by_id("a"), 2.0)
+        assert runner.actor_usage_by_type["generic"] == 1.0
+        assert runner.actor_usage == 1.0
+
+    def test_completed_and_aborted_steps_match_status(self, shared_actor_program):
+        """Test that completed_steps and aborted_steps follow step status."""
+        runner = ProgramRunner(shared_actor_program)
+        self._start_all(runner)
+
+        runner.complete_step(runner.get_step_by_id("a"), 10.0)
+        runner.abort_step(runner.get_step_by_id("b"), 11.0)
+
+        assert runner.completed_steps == {"a"}
+        assert runner.aborted_steps == {"b"}
+        assert not runner.running_steps
+        for step_id, step in runner.steps.items():
+            assert (step_id in runner.completed_steps) == (
+                step.status == StepStatus.COMPLETED
+            )
+            assert (step_id in runner.aborted_steps) == (
+                step.status == StepStatus.ABORTED
+            )
+        assert runner.get_status_display(runner.get_step_by_id("a").status) == (
+            "COMPLETED"
+        )
+        assert runner.get_status_display(runner.get_step_by_id("b").status) == (
+            "ABORTED"
+        )
+        assert runner.actor_usage == 0.0
+
+
 @pytest.mark.unit
 class TestProgramRunnerUtilities:
     """Test utility functions of program runner."""